@@ -5,12 +5,16 @@ import json
 import logging
 import pickle
 from collections.abc import Callable, Iterable
-from typing import Any
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
 
 import apsw
 
 from .model import RowMeta, is_row_model, native_columntypes, schematype
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,36 +51,49 @@ class AdaptConvertRegistry:
     def __init__(self):
         self._adapters: dict[type, Callable] = {}
         self._converters: dict[str, Callable] = {}
-        self._model_converters: dict[type, Callable[[apsw.SQLiteValues], tuple]] = {}
+        # Per model row_trace functions, built and cached here by .cursorproxy
+        self.model_row_traces: dict[type, Callable[[apsw.Cursor, apsw.SQLiteValues], Any]] = {}
+        self._model_adapters: dict[type, Callable[[dict[str, Any]], tuple]] = {}
 
     def __call__(self, connection: apsw.Connection) -> AdaptConvertCursor:
         "Returns a new convertor :class:`cursor <apsw.Cursor>` for the `connection`"
         return AdaptConvertRegistry.AdaptConvertCursor(connection, self)
 
     def is_valid_adapttype(self, AdaptType: type) -> bool:
-        return AdaptType in native_columntypes or AdaptType in self._adapters
+        return AdaptType in native_columntypes or AdaptType in self._adapters or self._register_on_first_use(AdaptType)
+
+    def _register_on_first_use(self, AdaptType: Any) -> bool:
+        """Register the included pair for a type from an optional dependency, see `on_first_use_adapt_convert_types`.
+
+        Its module is necessarily imported already if the type is in use, so nothing is imported here.
+        """
+        if not isinstance(AdaptType, type):
+            return False
+        match on_first_use_adapt_convert_types.get(f"{AdaptType.__module__}.{AdaptType.__qualname__}"):
+            case None:
+                return False
+            case adapt, convert:
+                self.register_adapt_convert(AdaptType, adapt, convert)
+                return True
 
     def adapt_value(self, value: Any) -> apsw.SQLiteValue:
         "Returns SQLite representation of `value`"
         adapter = self._adapters.get(type(value))
         if adapter:
             return adapter(value)
+        if self._register_on_first_use(type(value)):
+            return self._adapters[type(value)](value)
         # Fallback for Roww models - extract id for FK storage
         if is_row_model(type(value)):
             return value.id
         raise TypeError(f"No adapter registered for type {type(value)}")
 
-    def make_converter_for_model(self, Model: RowMeta) -> Callable[[apsw.SQLiteValues], tuple]:
-        """Build and cache an optimized row-converter for *Model*.
+    def field_converters(self, Model: RowMeta) -> tuple[Callable | None, ...]:
+        """The converter for each of *Model*'s fields, in field order.
 
-        Validates that every field type has a registered adapter, then
-        generates (via ``exec``) a tight converter function that maps a
-        raw SQLite row-tuple to a Python-typed tuple.  None values are
-        passed through without calling converters.  Fields whose
-        schematype has no converter are passed through as-is.
+        Validates that every field type has a registered adapter.  Fields whose
+        schematype has no converter get None, their values are used as-is.
         """
-
-        # -- validate field types ------------------------------------------------
         for field in Model.meta.fields:
             if field.type == Model:
                 continue  # recursive self-reference
@@ -85,32 +102,58 @@ class AdaptConvertRegistry:
             if not self.is_valid_adapttype(field.type):
                 raise UnregisteredFieldTypeError(field.type)
 
-        # -- build converter via exec -------------------------------------------
+        return tuple(self._converters.get(field.sql_typename) for field in Model.meta.fields)
+
+    def make_adapter_for_model(self, Model: RowMeta) -> Callable[[dict[str, Any]], tuple]:
+        """Build and cache a row-adapter for *Model*.
+
+        Generates (via ``exec``) a function that reads a row's ``__dict__`` into a
+        parameter tuple in field order, calling the adapter registered for each
+        field's type directly.  Values which aren't exactly of the field's type
+        (None, subclasses, ...) are passed through as-is, leaving them to apsw and
+        `_convert_binding` as before.  Foreign keys bind their related row's id,
+        whether the row itself or a not yet fetched `Lazy` of it.
+
+        When none of the fields need adapting, this is just an ``itemgetter`` of the
+        field names, which builds the tuple in C.
+        """
+        for field in Model.meta.fields:
+            if field.type not in self._adapters:
+                self._register_on_first_use(field.type)
+
+        names = [field.name for field in Model.meta.fields]
+        if len(names) > 1 and not any(field.type in self._adapters or field.is_fk for field in Model.meta.fields):
+            self._model_adapters[Model] = itemgetter(*names)
+            return self._model_adapters[Model]
+
         ns: dict[str, Any] = {}
         parts: list[str] = []
         for i, field in enumerate(Model.meta.fields):
-            converter = self._converters.get(field.sql_typename)
-            if converter is not None:
-                cname = f'_c{i}'
-                ns[cname] = converter
-                parts.append(f'{cname}(r[{i}]) if r[{i}] is not None else None')
+            adapter = self._adapters.get(field.type)
+            if field.is_fk:
+                parts.append(f'getattr(v := d[{field.name!r}], "id", v)')
+            elif adapter is not None:
+                aname, tname = f'_a{i}', f'_t{i}'
+                ns[aname] = adapter
+                ns[tname] = field.type
+                parts.append(f'{aname}(v) if type(v := d[{field.name!r}]) is {tname} else v')
             else:
-                parts.append(f'r[{i}]')
+                parts.append(f'd[{field.name!r}]')
 
         body = ', '.join(parts)
-        func_code = f'def _convert(r):\n    return ({body},)'
+        func_code = f'def _adapt(d):\n    return ({body},)'
         exec(func_code, ns)
-        converter_func = ns['_convert']
+        adapter_func = ns['_adapt']
 
-        self._model_converters[Model] = converter_func
-        return converter_func
+        self._model_adapters[Model] = adapter_func
+        return adapter_func
 
-    def get_model_converter(self, Model: RowMeta) -> Callable[[apsw.SQLiteValues], tuple]:
-        """Return the cached converter for *Model*, building one if needed."""
+    def get_model_adapter(self, Model: RowMeta) -> Callable[[dict[str, Any]], tuple]:
+        """Return the cached adapter for *Model*, building one if needed."""
         try:
-            return self._model_converters[Model]
+            return self._model_adapters[Model]
         except KeyError:
-            return self.make_converter_for_model(Model)
+            return self.make_adapter_for_model(Model)
 
     def _convert_binding(self, _: apsw.Cursor, __: int, value: Any) -> apsw.SQLiteValue:
         # TODO: I think we could make this smarter by storing the adapters for a specific Model as a tuple and indexing into it, instead of calling adapt_value each time
@@ -129,6 +172,11 @@ class AdaptConvertRegistry:
 
         self._adapters[AdaptConvertType] = adapt
         self._converters[schematype(AdaptConvertType)] = convert
+        if is_row_model(AdaptConvertType):
+            return  # foreign keys are bound by id and read as Lazy, neither uses the table model's adapter or converter
+        # Either may have been built without this type's adapter or converter
+        self._model_adapters.clear()
+        self.model_row_traces.clear()
 
     def register_pickleable_adapt_convert(self, AdaptConvertType: type, *, overwrite: bool = True) -> None:
         self.register_adapt_convert(
@@ -137,6 +185,18 @@ class AdaptConvertRegistry:
             convert=lambda data: pickle.loads(data),
         )
 
+    def register_dataframe_adapt_convert(self) -> None:
+        """Store pandas DataFrames as Arrow IPC, which otherwise happens on first use of a DataFrame field"""
+        from pandas import DataFrame
+
+        self.register_adapt_convert(DataFrame, adapt_dataframe, convert_dataframe)
+
+    def register_parquet_dataframe_adapt_convert(self) -> None:
+        """Store pandas DataFrames as Parquet rather than the default Arrow IPC, requires pyarrow"""
+        from pandas import DataFrame
+
+        self.register_adapt_convert(DataFrame, adapt_dataframe_parquet, convert_dataframe)
+
     def register_included_adaptconverters(self, Types: Iterable[type]) -> None:
         """Register multiple standard adapt/convert pairs at once"""
         for Type in Types:
@@ -147,25 +207,131 @@ class AdaptConvertRegistry:
                     self.register_adapt_convert(Type, adapt, convert)
 
 
-included_adapt_convert_types: dict[type, tuple[Callable, Callable]] = {
-    bool: (
-        lambda boolean: boolean,
-        lambda integer: bool(integer),
-    ),
-    list: (
-        lambda obj: json.dumps(obj),
-        lambda string: json.loads(string),
-    ),
-    dict: (
-        lambda obj: json.dumps(obj),
-        lambda string: json.loads(string),
-    ),
+_EPOCH = dt.datetime(1970, 1, 1)
+_MICROSECOND = dt.timedelta(microseconds=1)
+
+
+def adapt_datetime(datetime: dt.datetime) -> int | str:
+    """Store a naive datetime as integer microseconds since the unix epoch (8 bytes vs ~26 for ISO text).
+
+    An aware datetime is stored as ISO text, which keeps its utc offset.
+    """
+    if datetime.utcoffset() is not None:
+        return datetime.isoformat()
+    return (datetime - _EPOCH) // _MICROSECOND
+
+
+def convert_datetime(value: int | str) -> dt.datetime:
+    if isinstance(value, str):  # aware, or naive but written before they were stored as integers
+        return dt.datetime.fromisoformat(value)
+    return _EPOCH + dt.timedelta(microseconds=value)
+
+
+def convert_date(value: int | str) -> dt.date:
+    if isinstance(value, str):  # rows written before dates were stored as ordinals
+        return dt.date.fromisoformat(value)
+    return dt.date.fromordinal(value)
+
+
+# Per field type, an SQL expression giving the integer form of ISO text written by earlier versions, and the
+# condition on the text for it to apply. Naive only, aware datetimes are still stored as ISO text.
+_ISO_TO_INTEGER_SQL: dict[type, tuple[str, str]] = {
     dt.date: (
-        lambda date: date.isoformat(),
-        lambda string: dt.date.fromisoformat(string),
+        "CAST(julianday({c}) - 1721424.5 AS INTEGER)",  # julian day of 0001-01-01 is 1721425.5, its ordinal 1
+        "length({c}) = 10 AND julianday({c}) IS NOT NULL",
     ),
     dt.datetime: (
-        lambda datetime: datetime.isoformat(),
-        lambda string: dt.datetime.fromisoformat(string),
+        "unixepoch(substr({c}, 1, 19)) * 1000000 + iif(length({c}) = 26, CAST(substr({c}, 21, 6) AS INTEGER), 0)",
+        "length({c}) IN (19, 26) AND unixepoch(substr({c}, 1, 19)) IS NOT NULL",
     ),
 }
+
+
+def generate_iso_to_integer_migration_sql(Model: RowMeta) -> str:
+    """UPDATE statements rewriting `Model`'s dates and datetimes stored as ISO text by earlier versions to integers.
+
+    Those rows still read back correctly, but SQLite orders every INTEGER before every TEXT, so comparisons,
+    ORDER BY and `find_by`/`select` equality are wrong across the two forms. Run these once on existing
+    databases, e.g. as a migration script, see migrate.md.
+    """
+    meta = Model.meta
+    statements: list[str] = []
+    for field in meta.fields:
+        match _ISO_TO_INTEGER_SQL.get(field.type):
+            case None:
+                continue
+            case expression, condition:
+                c = field.name
+                statements.append(f"UPDATE {meta.table_name} SET {c} = {expression.format(c=c)} WHERE typeof({c}) = 'text' AND {condition.format(c=c)};")
+    return "\n".join(statements)
+
+
+# Pairs reference the (mostly C) callables directly, a wrapping lambda would add a python frame per value
+included_adapt_convert_types: dict[type, tuple[Callable, Callable]] = {
+    bool: (int, bool),
+    list: (json.dumps, json.loads),
+    dict: (json.dumps, json.loads),
+    dt.date: (dt.date.toordinal, convert_date),  # proleptic Gregorian ordinal, 0001-01-01 is 1
+    dt.datetime: (adapt_datetime, convert_datetime),
+}
+
+
+def adapt_dataframe(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as a columnar Arrow IPC stream, or pickle if pyarrow is not installed or can't represent it.
+
+    Column buffers are LZ4 compressed, cheap to decompress and typically a 2-4x smaller blob for numeric frames.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return pickle.dumps(df, protocol=5)
+
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):  # e.g. object columns of mixed types, which pickle can still store
+        return pickle.dumps(df, protocol=5)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression="lz4")) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def adapt_dataframe_parquet(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as zstd compressed Parquet, an opt-in alternative to `adapt_dataframe`.
+
+    Parquet's encodings give smaller blobs on repetitive data, at the cost of slower writes and reads.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pickle.dumps(df, protocol=5)
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue().to_pybytes()
+
+
+def convert_dataframe(data: bytes) -> pd.DataFrame:
+    # Pickles (protocol 2+) start with PROTO and Parquet files with PAR1, Arrow IPC streams never do.
+    # This keeps blobs readable whichever DataFrame adapter, or `register_pickleable_adapt_convert`, wrote them.
+    if data[:1] == pickle.PROTO:
+        return pickle.loads(data)
+
+    import pyarrow as pa
+
+    if data[:4] == b"PAR1":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(pa.BufferReader(data)).to_pandas()
+
+    return pa.ipc.open_stream(pa.BufferReader(data)).read_all().to_pandas()
+
+
+# Types from optional dependencies, by "module.qualname" so they needn't be imported (pandas alone adds ~0.5s
+# to import time). Each registry registers the pair the first time it meets the type, see `_register_on_first_use`.
+on_first_use_adapt_convert_types: dict[str, tuple[Callable, Callable]] = {
+    "pandas.DataFrame": (adapt_dataframe, convert_dataframe),
+    "pandas.core.frame.DataFrame": (adapt_dataframe, convert_dataframe),  # pandas < 3
+}
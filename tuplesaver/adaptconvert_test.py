@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import datetime as dt
+import pickle
+import subprocess
+import sys
 from dataclasses import fields
+from pathlib import Path
 
 import pytest
 
-from .adaptconvert import InvalidAdaptConvertType
+from .adaptconvert import InvalidAdaptConvertType, adapt_datetime, generate_iso_to_integer_migration_sql
 from .engine import Engine
+from .engine_test import Person, Team
 from .model import TableRow
 
 
@@ -110,20 +115,119 @@ def test_attempted_registration_of_already_registered_type(engine: Engine) -> No
     assert converters['tuplesaver.adaptconvert_test.test_attempted_registration_of_already_registered_type.<locals>.NewType'] is convert_newtype2
 
 
-def test_can_store_and_retrieve_datetime_as_iso(engine: Engine) -> None:
+def test_model_adapter_adapts_by_field_type(engine: Engine) -> None:
+    class T(TableRow):
+        day: dt.date
+        at: dt.datetime | None
+
+    engine.ensure_table_created(T)
+    adapt = engine.adapt_convert_registry.get_model_adapter(T)
+
+    assert adapt(vars(T(dt.date(2020, 1, 2), None))) == (None, dt.date(2020, 1, 2).toordinal(), None)
+    # a datetime is a date, values not exactly of the field's type are left to apsw to adapt by their own type
+    assert adapt(vars(T(dt.datetime(2020, 1, 2), None)))[1] == dt.datetime(2020, 1, 2)
+
+
+def test_model_adapter_without_adapted_fields(engine: Engine) -> None:
+    class T(TableRow):
+        name: str
+        score: float | None
+
+    engine.ensure_table_created(T)
+    adapt = engine.adapt_convert_registry.get_model_adapter(T)
+
+    assert adapt(vars(T("a", None, id=3))) == (3, "a", None)
+
+
+def test_model_adapter_rebuilt_after_registering(engine: Engine) -> None:
+    class NewType:
+        pass
+
+    class T(TableRow):
+        value: NewType
+
+    engine.adapt_convert_registry.register_adapt_convert(NewType, lambda _: b"1", lambda _: NewType())
+    engine.ensure_table_created(T)
+    assert engine.adapt_convert_registry.get_model_adapter(T)(vars(T(NewType()))) == (None, b"1")
+
+    engine.adapt_convert_registry.register_adapt_convert(NewType, lambda _: b"2", lambda _: NewType())
+    assert engine.adapt_convert_registry.get_model_adapter(T)(vars(T(NewType()))) == (None, b"2")
+
+
+def test_model_adapter_kept_when_registering_table_models(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    adapt = engine.adapt_convert_registry.get_model_adapter(Team)
+
+    engine.ensure_table_created(Person)
+
+    assert engine.adapt_convert_registry.get_model_adapter(Team) is adapt
+
+
+def test_can_store_and_retrieve_datetime_as_epoch_microseconds(engine: Engine) -> None:
+    class T(TableRow):
+        date: dt.datetime
+
+    engine.ensure_table_created(T)
+    now = dt.datetime.now()
+    row = engine.save(T(now))
+
+    stored = engine.connection.execute("SELECT date FROM T").fetchall()
+    assert stored == [((now - dt.datetime(1970, 1, 1)) // dt.timedelta(microseconds=1),)]
+
+    returned_row = engine.find(T, row.id)
+
+    assert returned_row.date == now
+
+
+def test_can_retrieve_datetime_stored_as_iso(engine: Engine) -> None:
     class T(TableRow):
         date: dt.datetime
 
     engine.ensure_table_created(T)
     now = dt.datetime.now()
+    engine.connection.execute("INSERT INTO T (date) VALUES (?)", (now.isoformat(),))
+
+    returned_row = engine.find(T, 1)
+
+    assert returned_row.date == now
+
+
+def test_can_store_and_retrieve_aware_datetime_as_iso(engine: Engine) -> None:
+    class T(TableRow):
+        date: dt.datetime
+
+    engine.ensure_table_created(T)
+    now = dt.datetime.now(dt.timezone(dt.timedelta(hours=-5)))
     row = engine.save(T(now))
 
+    stored = engine.connection.execute("SELECT date FROM T").fetchall()
+    assert stored == [(now.isoformat(),)]
+
     returned_row = engine.find(T, row.id)
 
     assert returned_row.date == now
+    assert returned_row.date.utcoffset() == now.utcoffset()
 
 
-def test_can_store_and_retrieve_date_as_iso(engine: Engine) -> None:
+def test_iso_to_integer_migration__datetimes(engine: Engine) -> None:
+    class T(TableRow):
+        date: dt.datetime | None
+        name: str
+
+    engine.ensure_table_created(T)
+    naive = [dt.datetime(2020, 1, 2, 3, 4, 5, 678901), dt.datetime(1969, 12, 31, 23, 59, 59, 500000), dt.datetime(2021, 1, 1)]
+    aware = dt.datetime(2020, 1, 1, tzinfo=dt.UTC)
+    for value in [*naive, aware]:
+        engine.connection.execute("INSERT INTO T (date, name) VALUES (?, 'legacy')", (value.isoformat(),))
+    engine.connection.execute("INSERT INTO T (date, name) VALUES ('not a date', 'legacy'), (NULL, 'legacy')")
+
+    engine.connection.execute(generate_iso_to_integer_migration_sql(T))
+
+    stored = [date for (date,) in engine.connection.execute("SELECT date FROM T ORDER BY id")]
+    assert stored == [*map(adapt_datetime, naive), aware.isoformat(), "not a date", None]
+
+
+def test_can_store_and_retrieve_date_as_ordinal(engine: Engine) -> None:
     class T(TableRow):
         date: dt.date
 
@@ -131,11 +235,45 @@ def test_can_store_and_retrieve_date_as_iso(engine: Engine) -> None:
     today = dt.date.today()
     row = engine.save(T(today))
 
+    stored = engine.connection.execute("SELECT date FROM T").fetchall()
+    assert stored == [(today.toordinal(),)]
+
     returned_row = engine.find(T, row.id)
 
     assert returned_row.date == today
 
 
+def test_can_retrieve_date_stored_as_iso(engine: Engine) -> None:
+    class T(TableRow):
+        date: dt.date
+
+    engine.ensure_table_created(T)
+    today = dt.date.today()
+    engine.connection.execute("INSERT INTO T (date) VALUES (?)", (today.isoformat(),))
+
+    returned_row = engine.find(T, 1)
+
+    assert returned_row.date == today
+
+
+def test_iso_to_integer_migration__dates(engine: Engine) -> None:
+    class T(TableRow):
+        day: dt.date | None
+        at: dt.datetime | None
+
+    engine.ensure_table_created(T)
+    days = [dt.date(1, 1, 1), dt.date(2020, 1, 2), dt.date(9999, 12, 31)]
+    for day in days:
+        engine.connection.execute("INSERT INTO T (day) VALUES (?)", (day.isoformat(),))
+    engine.connection.execute("INSERT INTO T (day) VALUES ('not a date'), (NULL)")
+
+    engine.connection.execute(generate_iso_to_integer_migration_sql(T))
+
+    stored = [day for (day,) in engine.connection.execute("SELECT day FROM T ORDER BY id")]
+    assert stored == [*(day.toordinal() for day in days), "not a date", None]
+    assert [engine.find(T, i).day for i in (1, 2, 3)] == days
+
+
 def test_can_store_and_retrieve_bool_as_int(engine: Engine) -> None:
     class T(TableRow):
         flag: bool
@@ -209,3 +347,91 @@ def test_can_store_and_retrieve_pickleable_type(engine: Engine) -> None:
     returned_row = engine.find(T, row.id)
 
     assert returned_row.data.value == sentinel_instance.value
+
+
+def test_can_store_and_retrieve_dataframe(engine: Engine) -> None:
+    pd = pytest.importorskip("pandas")
+
+    class T(TableRow):
+        df: pd.DataFrame
+
+    engine.ensure_table_created(T)
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]}, index=[5, 6, 7])
+    row = engine.save(T(df))
+
+    returned_row = engine.find(T, row.id)
+
+    pd.testing.assert_frame_equal(returned_row.df, df)
+
+
+def test_dataframe_is_stored_compressed(engine: Engine) -> None:
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    class T(TableRow):
+        df: pd.DataFrame
+
+    engine.ensure_table_created(T)
+    df = pd.DataFrame({"a": [0.0] * 10_000})
+    engine.save(T(df))
+
+    (size,) = engine.connection.execute("SELECT length(df) FROM T").fetchone()
+    assert size < df.memory_usage().sum() / 10
+
+
+def test_can_store_and_retrieve_dataframe_as_parquet(engine: Engine) -> None:
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    class T(TableRow):
+        df: pd.DataFrame
+
+    engine.adapt_convert_registry.register_parquet_dataframe_adapt_convert()
+    engine.ensure_table_created(T)
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]}, index=[5, 6, 7])
+    row = engine.save(T(df))
+
+    (blob,) = engine.connection.execute("SELECT df FROM T").fetchone()
+    assert blob[:4] == b"PAR1"
+
+    returned_row = engine.find(T, row.id)
+
+    pd.testing.assert_frame_equal(returned_row.df, df)
+
+
+def test_dataframe_arrow_cannot_represent__stored_as_pickle(engine: Engine) -> None:
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    class T(TableRow):
+        df: pd.DataFrame
+
+    engine.ensure_table_created(T)
+    df = pd.DataFrame({"a": [1, "x", 2.5]})
+    row = engine.save(T(df))
+
+    (blob,) = engine.connection.execute("SELECT df FROM T").fetchone()
+    assert blob[:1] == pickle.PROTO
+
+    pd.testing.assert_frame_equal(engine.find(T, row.id).df, df)
+
+
+def test_import_does_not_import_pandas() -> None:
+    code = "import sys, tuplesaver.engine; assert 'pandas' not in sys.modules"
+
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parent.parent)
+
+
+def test_can_retrieve_dataframe_stored_as_pickle(engine: Engine) -> None:
+    pd = pytest.importorskip("pandas")
+
+    class T(TableRow):
+        df: pd.DataFrame
+
+    engine.ensure_table_created(T)
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    engine.connection.execute("INSERT INTO T (df) VALUES (?)", (pickle.dumps(df),))
+
+    returned_row = engine.find(T, 1)
+
+    pd.testing.assert_frame_equal(returned_row.df, df)
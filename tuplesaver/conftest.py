@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import inspect
 import os
 import sys
 from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
 
 import apsw
 import pytest
@@ -14,11 +16,52 @@ from .engine import Engine
 
 def pytest_configure(config: pytest.Config) -> None:
     config.addinivalue_line("markers", "scenario(name): specify migrate test scenario folder")
+    config.addinivalue_line("markers", "shared_engine: use the session wide engine, rolling back the test's changes afterwards")
 
 
-@pytest.fixture
-def engine() -> Iterable[Engine]:
+# For the in-memory test engines only, there is no file to sync, and no schema functions to trust
+MEMORY_ENGINE_PRAGMAS: dict[str, apsw.SQLiteValue] = {
+    "synchronous": "OFF",
+    "trusted_schema": False,
+}
+
+
+def make_memory_engine() -> Engine:
     engine = Engine(":memory:")
+    for pragma, value in MEMORY_ENGINE_PRAGMAS.items():
+        engine.connection.pragma(pragma, value)
+    engine.adapt_convert_registry.register_included_adaptconverters(included_adapt_convert_types)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def session_engine() -> Iterable[Engine]:
+    engine = make_memory_engine()
+    yield engine
+    engine.connection.close()
+
+
+@pytest.fixture
+def engine(request: pytest.FixtureRequest) -> Iterable[Engine]:
+    if request.node.get_closest_marker("shared_engine"):
+        # Tables and rows, but not adapters or converters, are undone by the rollback
+        engine = request.getfixturevalue("session_engine")
+        engine.connection.execute("SAVEPOINT shared_engine")
+        yield engine
+        engine.connection.execute("ROLLBACK TO shared_engine; RELEASE shared_engine")
+        return
+
+    engine = make_memory_engine()
+    yield engine
+    engine.connection.close()
+
+
+@pytest.fixture
+def file_engine(tmp_path: Path) -> Iterable[Engine]:
+    """An on-disk Engine in WAL mode, for benchmarks that should include real page and journal IO"""
+    engine = Engine(tmp_path / "db.sqlite")
+    engine.connection.pragma("journal_mode", "wal")
+    engine.connection.pragma("synchronous", "NORMAL")  # as Engine defaults to for databases already in WAL mode
     engine.adapt_convert_registry.register_included_adaptconverters(included_adapt_convert_types)
     yield engine
     engine.connection.close()
@@ -29,8 +72,9 @@ class SqlLog:
         self.entrys = []
         self.block = ""
 
-    def exec_trace(self, cursor: apsw.Cursor, sql: str, values: Sequence | Mapping | None, /) -> bool:
-        self.log(cursor.expanded_sql)
+    def exec_trace(self, cursor: apsw.Cursor | apsw.Connection, sql: str, values: Sequence | Mapping | None, /) -> bool:
+        # apsw passes the Connection for the statements of `with connection:` blocks
+        self.log(cursor.expanded_sql if isinstance(cursor, apsw.Cursor) else sql)
         return True  # continue normal execution
 
     def log(self, entry: str) -> None:
@@ -48,6 +92,7 @@ class SqlLog:
 
 @pytest.fixture
 def sql_log(engine: Engine) -> Iterable[SqlLog]:
+    """Record, and echo to stdout, every statement the engine runs. Opt-in, keep it out of benchmarks."""
     sql_log = SqlLog()
     engine.connection.exec_trace = sql_log.exec_trace
     yield sql_log
@@ -70,7 +115,11 @@ def benchmark(benchmark: BenchmarkFixture) -> Iterable[BenchmarkFixture]:
 
 @pytest.fixture
 def limit_stack_depth() -> Iterable[None]:
+    """Allow the test only 55 frames on top of pytest's own, to catch recursion that scales with the data"""
     old_limit = sys.getrecursionlimit()
-    sys.setrecursionlimit(55)
+    depth, frame = 0, inspect.currentframe()
+    while frame is not None:
+        depth, frame = depth + 1, frame.f_back
+    sys.setrecursionlimit(depth + 55)
     yield
     sys.setrecursionlimit(old_limit)
@@ -1,8 +1,8 @@
 # Provides various useful routines
 from __future__ import annotations
 
-from dataclasses import replace
-from typing import TYPE_CHECKING, cast
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any, cast
 
 import apsw
 import apsw.unicode
@@ -30,6 +30,15 @@ class Lazy[Model]:
             self._cached = self._engine.find(self._model, self._id)
         return cast(Model, self._cached)
 
+    @property
+    def id(self) -> int:
+        """The related row's id, known without fetching it"""
+        return self._id
+
+    def prime(self, rows: Mapping[int, Model]) -> None:
+        """Use the already fetched row with this id, if `rows` has it, rather than fetching it on access"""
+        self._cached = rows.get(self._id)
+
     def __hash__(self):
         return hash((self._model, self._id))
 
@@ -48,44 +57,63 @@ class Lazy[Model]:
         return f"<{self.__class__.__name__}:{self._cached!r}>"
 
 
-def _make_model_lazy[R: Row | TableRow](RootModel: type[R], c: apsw.Cursor, root_row: apsw.SQLiteValues, engine: Engine) -> R:
-    """Lazy loading of relationships, only fetches sub-models when accessed."""
-
-    # For Roww models, create with kwargs (handles kw_only id field)
-    # dataclasses model
-    field_names = [f for f in RootModel.__dataclass_fields__]
-    row = RootModel(**dict(zip(field_names, root_row, strict=True)))
+def _make_row_trace[R: Row | TableRow](Model: type[R], engine: Engine) -> Callable[[apsw.Cursor, apsw.SQLiteValues], R]:
+    """Build (via ``exec``) the row_trace that makes a `Model` from a raw SQLite row.
+
+    Conversion, Lazy wrapping of foreign keys, and construction are all inlined into a single
+    call, e.g. for a TableRow ``Model(_c1(v[1]) if v[1] is not None else None, v[2], id=v[0])``,
+    so a row costs one Python frame and no intermediate tuples. kw_only fields, such as a
+    TableRow's `id`, are passed by keyword.
+
+    Foreign keys of table models become `Lazy` proxies, only fetching sub-models when accessed.
+    """
+    converters = engine.adapt_convert_registry.field_converters(Model)
+    fks = {idx for idx, f in enumerate(Model.meta.fields) if f.is_fk} if is_row_model(Model) else set()
+
+    ns: dict[str, Any] = {'_Model': Model, '_Lazy': Lazy, '_engine': engine}
+    positional: list[str] = []
+    keyword: list[str] = []
+    for i, (name, f) in enumerate(Model.__dataclass_fields__.items()):
+        value = f'v[{i}]'
+        if i in fks:
+            ns[f'_F{i}'] = Model.meta.fields[i].type
+            value = f'_Lazy(_engine, _F{i}, v[{i}]) if v[{i}] is not None else None'
+        elif converters[i] is not None:
+            ns[f'_c{i}'] = converters[i]
+            value = f'_c{i}(v[{i}]) if v[{i}] is not None else None'
+        if f.kw_only:
+            keyword.append(f'{name}={value}')
+        else:
+            positional.append(value)
+
+    if not keyword and all(value == f'v[{i}]' for i, value in enumerate(positional)):
+        args = '*v'  # nothing to convert, e.g. an adhoc Row of native types, the row splats straight in
+    else:
+        args = ", ".join(positional + keyword)
+    exec(f'def _row_trace(c, v):\n    return _Model({args})', ns)
+    return ns['_row_trace']
 
-    if not is_row_model(RootModel):
-        # adhoc dataclass
-        return row
 
-    RootModel: type[TableRow] = cast(type[TableRow], RootModel)
-    meta = RootModel.meta
-    # Now iterate over the fields and replace any foreign keys with Lazy proxies
-    for idx, fld in enumerate(meta.fields):
-        if fld.type is not None and is_row_model(fld.type):
-            # Replace with Lazy proxy
-            fk_value = root_row[idx]
-            assert isinstance(fk_value, int | type(None))
-            if fk_value is not None:
-                row = replace(row, **{fld.name: Lazy(engine, fld.type, fk_value)})
-
-    return row  # Return the root model with lazy-loaded relationships
+class TypedCursorProxy[R: Row | TableRow](apsw.Cursor):
+    """Typing only, `proxy_cursor_lazy` returns the apsw cursor itself with a row_trace set, never an instance of this.
 
+    So there is no delegation, attribute access and fetches go straight to the C cursor.
+    """
 
-class TypedCursorProxy[R: Row | TableRow](apsw.Cursor):
     def fetchone(self) -> R | None: ...
 
     def fetchall(self) -> list[R]: ...  # ty:ignore[invalid-method-override, invalid-return-type]
 
-    @staticmethod
-    def proxy_cursor_lazy(Model: type[R], cursor: apsw.Cursor, engine: Engine) -> TypedCursorProxy[R]:
-        convert = engine.adapt_convert_registry.get_model_converter(Model)
+    def __iter__(self) -> TypedCursorProxy[R]: ...  # ty:ignore[invalid-method-override, invalid-return-type]
 
-        def row_fac_lazy(c: apsw.Cursor, r: apsw.SQLiteValues) -> R:
-            return _make_model_lazy(Model, c, convert(r), engine)
+    def __next__(self) -> R: ...  # ty:ignore[invalid-method-override, invalid-return-type]
 
-        cursor.row_trace = row_fac_lazy
+    @staticmethod
+    def proxy_cursor_lazy(Model: type[R], cursor: apsw.Cursor, engine: Engine) -> TypedCursorProxy[R]:
+        row_traces = engine.adapt_convert_registry.model_row_traces
+        try:
+            cursor.row_trace = row_traces[Model]
+        except KeyError:
+            cursor.row_trace = row_traces[Model] = _make_row_trace(Model, engine)
 
         return cast(TypedCursorProxy[R], cursor)
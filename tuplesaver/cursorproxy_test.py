@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import NamedTuple, assert_type
+from typing import TYPE_CHECKING, NamedTuple, assert_type
 
 import apsw
 import pytest
@@ -24,7 +24,8 @@ def proxy(engine: Engine) -> TypedCursorProxy[M]:
     connection = engine.connection
     cursor = connection.execute(sql)
     proxy = TypedCursorProxy.proxy_cursor_lazy(M, cursor, engine)
-    assert_type(proxy, TypedCursorProxy[M])  # type: ignore slight bug in pyright, masked by both fixure here and engine.query in engine.py
+    if TYPE_CHECKING:
+        assert_type(proxy, TypedCursorProxy[M])  # type: ignore slight bug in pyright, masked by both fixure here and engine.query in engine.py
     return proxy
 
 
@@ -52,6 +53,16 @@ def test_proxy_fetchall(proxy: TypedCursorProxy[M]) -> None:
     assert rows == [M("Alice", 30, id=1), M("Bob", 40, id=2)]
 
 
+def test_proxy_iterates_lazily(proxy: TypedCursorProxy[M]) -> None:
+    for row in proxy:
+        if TYPE_CHECKING:
+            assert_type(row, M)
+        assert row == M("Alice", 30, id=1)
+        break
+
+    assert list(proxy) == [M("Bob", 40, id=2)]
+
+
 def test_proxy__after_usage__rowfactory_persists(proxy: TypedCursorProxy[M]) -> None:
     row = proxy.fetchone()
     assert row == M("Alice", 30, id=1)
@@ -61,6 +72,14 @@ def test_proxy__after_usage__rowfactory_persists(proxy: TypedCursorProxy[M]) ->
     assert row == M("Bob", 40, id=2)
 
 
+def test_proxy__row_trace_built_once_per_model(engine: Engine) -> None:
+    first = TypedCursorProxy.proxy_cursor_lazy(M, engine.connection.execute(sql), engine)
+    second = TypedCursorProxy.proxy_cursor_lazy(M, engine.connection.execute(sql), engine)
+
+    assert first.row_trace is second.row_trace
+    assert second.fetchall() == [M("Alice", 30, id=1), M("Bob", 40, id=2)]
+
+
 def test_proxy__fetchone_returns_none(proxy: TypedCursorProxy[M]) -> None:
     proxy.fetchone()
     proxy.fetchone()
@@ -157,6 +176,14 @@ def test_proxy__relations_can_be_fetched_lazily(engine: Engine) -> None:
     assert found_person == person  # Still equal after lazy loading
 
 
+def test_lazy_unwrapping__only_models_with_relations(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+
+    assert Team.__getattribute__ is object.__getattribute__
+    assert Person.__getattribute__ is not object.__getattribute__
+
+
 def test_proxy__lazy_relations__equal_by_id(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     engine.ensure_table_created(Person)
@@ -201,3 +228,14 @@ def test_proxy__when_querying_view_model__does_not_register_as_table_model(engin
     cur.fetchone()
 
     assert is_row_model(ModelA) is False
+
+
+def test_proxy__adhoc_model__native_types(engine: Engine) -> None:
+    class Summary(Row):
+        name: str
+        count: int
+        ratio: float | None
+
+    rows = engine.query(Summary, "SELECT 'a', 2, 0.5 UNION ALL SELECT 'b', 3, NULL").fetchall()
+
+    assert rows == [Summary("a", 2, 0.5), Summary("b", 3, None)]
@@ -3,14 +3,16 @@ from __future__ import annotations
 import logging
 import os
 import re
-from collections.abc import Sequence
-from dataclasses import fields
-from typing import Any, overload
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import cache
+from itertools import groupby
+from typing import Any, Literal, overload
 
 import apsw
 
 from .adaptconvert import AdaptConvertRegistry
-from .cursorproxy import TypedCursorProxy
+from .cursorproxy import Lazy, TypedCursorProxy
 
 # NOTE: engine.py should only know about .model, but not .query
 from .model import (
@@ -19,17 +21,35 @@ from .model import (
     is_row_model,
 )
 from .sql import (
+    ID_BATCH_SIZES,
     generate_create_table_ddl,
     generate_delete_sql,
     generate_insert_sql,
     generate_select_by_field_sql,
+    generate_select_by_id_sql,
+    generate_select_by_ids_sql,
     generate_select_sql,
+    generate_select_tree_sql,
     generate_update_set_fields_sql,
     generate_update_sql,
 )
 
 logger = logging.getLogger(__name__)
 
+# apsw keeps prepared statements keyed by SQL text, the default of 100 is easily exhausted by the
+# per-model SQL generators in .sql (4 fixed statements per model plus the by-field variants).
+# Those generators are memoized, so each call hands apsw the same str object, whose UTF-8 form
+# CPython keeps on the object, the lookup doesn't re-encode the SQL.
+STATEMENT_CACHE_SIZE = 512
+
+# Connection scoped tuning, applied when the Engine opens the connection itself.
+BUSY_TIMEOUT_MS = 5000
+CONNECTION_PRAGMAS: dict[str, apsw.SQLiteValue] = {
+    "cache_size": -65536,  # 64MiB page cache (negative is KiB)
+    "mmap_size": 268435456,  # 256MiB, reads served from the OS page cache without a copy
+    "temp_store": "MEMORY",
+}
+
 
 class TableSchemaMismatch(Exception):
     def __init__(self, table_name: str, existing_table_schema: str, new_table_schema: str) -> None:
@@ -58,6 +78,11 @@ class InvalidKwargFieldSpecifiedError(ValueError):
         super().__init__(f"Invalid fields for {Model.__name__}: {', '.join(kwargs.keys())}. Valid fields are: {', '.join(f.name for f in Model.meta.fields)}")
 
 
+class ColumnCountMismatchError(ValueError):
+    def __init__(self, Model: type[Row | TableRow], column_count: int) -> None:
+        super().__init__(f"Query returns {column_count} columns, but {Model.__name__} has {len(Model.meta.fields)} fields: {', '.join(f.name for f in Model.meta.fields)}")
+
+
 class IdNoneError(ValueError):
     pass
 
@@ -80,6 +105,7 @@ __all_errors__ = [
     LookupByAdHocModelImpossible,
     NoKwargFieldSpecifiedError,
     InvalidKwargFieldSpecifiedError,
+    ColumnCountMismatchError,
     IdNoneError,
     RecordNotFoundError,
     NoRecordToUpdateError,
@@ -87,81 +113,199 @@ __all_errors__ = [
 ]
 
 
+def _normalize_whitespace(s: str) -> str:
+    return re.sub(r'\s+', ' ', s).strip()
+
+
+@cache
+def _normalized_create_table_ddl(Model: type[TableRow]) -> str:
+    """The model's CREATE TABLE, normalized once for comparing against existing tables"""
+    return _normalize_whitespace(generate_create_table_ddl(Model))
+
+
+@cache
+def _fk_field_names(Model: type[TableRow]) -> tuple[str, ...]:
+    return tuple(f.name for f in Model.meta.fields if f.is_fk)
+
+
+@cache
+def _self_fk_field_names(Model: type[TableRow]) -> tuple[str, ...]:
+    return tuple(f.name for f in Model.meta.fields if f.type is Model)
+
+
 class Engine:
-    def __init__(self, db_path: str | os.PathLike[str] | apsw.Connection) -> None:
+    def __init__(self, db_path: str | os.PathLike[str] | apsw.Connection, *, durability: Literal["full", "normal"] | None = None, read_only: bool = False) -> None:
+        """Open `db_path`, or wrap an already open apsw.Connection which is then used as is.
+
+        A connection opened here gets a busy timeout and `CONNECTION_PRAGMAS`, and `durability` sets
+        `PRAGMA synchronous`. "normal" avoids an fsync on every commit, a power loss can drop the
+        last few commits (and in rollback journal mode, rarely, corrupt the file), "full" is SQLite's default.
+        By default it is "normal" if the database is already in WAL mode, where that is safe, and "full" otherwise.
+
+        `read_only` sets `PRAGMA query_only` so any write raises apsw.ReadOnlyError. Rather than sharing
+        one Engine between threads, give readers their own read_only Engines and keep a single writer,
+        in WAL mode readers then never wait on the writer.
+        """
         if isinstance(db_path, apsw.Connection):
             self.connection = db_path
             self.db_path = self.connection.filename
         else:
             self.db_path = db_path
-            self.connection: apsw.Connection = apsw.Connection(str(db_path))
+            self.connection: apsw.Connection = apsw.Connection(str(db_path), statementcachesize=STATEMENT_CACHE_SIZE)
+            self.connection.set_busy_timeout(BUSY_TIMEOUT_MS)
+            for pragma, value in CONNECTION_PRAGMAS.items():
+                self.connection.pragma(pragma, value)
+            if durability is None:
+                durability = "normal" if self.connection.pragma("journal_mode") == "wal" else "full"
+            self.connection.pragma("synchronous", durability.upper())
+
+        if read_only:
+            self.connection.pragma("query_only", True)
 
         self.adapt_convert_registry = AdaptConvertRegistry()
         self.connection.cursor_factory = self.adapt_convert_registry
+        # Model -> `PRAGMA schema_version` when its table was last created or checked, see ensure_table_created
+        self._ensured_tables: dict[type[TableRow], int] = {}
+        # Model -> its SELECT by id, so find skips the table model check and the generator's cache after the first call
+        self._select_by_id_sql: dict[type[TableRow], str] = {}
+
+    @contextmanager
+    def transaction(self) -> Iterator[Engine]:
+        """Run the block in a single transaction, committed on success and rolled back on an exception.
+
+        Outside of a transaction each statement commits on its own (SQLite autocommit), so batching writes
+        here saves a commit, and with durability="full" an fsync, per statement. The outermost transaction
+        is BEGIN IMMEDIATE, taking the write lock up front so it can't fail with busy when upgrading from a
+        read. Nested transactions become savepoints, rolling back only their own block.
+        """
+        conn = self.connection
+        prev_mode = conn.transaction_mode
+        conn.transaction_mode = "IMMEDIATE"
+        try:
+            with conn:
+                yield self
+        finally:
+            conn.transaction_mode = prev_mode
 
     def ensure_table_created(self, Model: type[TableRow]) -> None:
+        """CREATE the table for `Model`, or check that the existing table matches it.
+
+        Repeat calls are skipped while the schema is unchanged since the last call for `Model`, and the table still exists.
+        """
         assert is_row_model(Model), f"Model `{Model.__name__}` is not a valid table model."
         meta = Model.meta
 
+        if self._ensured_tables.get(Model) == self.connection.pragma("schema_version") and self.connection.table_exists(None, meta.table_name):
+            return
+
         ddl = generate_create_table_ddl(Model)
 
-        try:
+        # One lookup decides between creating and checking, rather than attempting the CREATE and
+        # reading the existing table's SQL back after it fails. Table names are case insensitive.
+        query = "SELECT sql FROM sqlite_schema WHERE type = 'table' AND name = ? COLLATE NOCASE"
+        existing = self.connection.execute(query, (meta.table_name,)).fetchall()
+        if not existing:
             self.connection.execute(ddl)
-        except apsw.SQLError as e:
-            assert meta.table_name is not None, "Table name must be defined for the model to create it."
-            if f"table {meta.table_name} already exists" in str(e):
-                # Check existing table, it might be ok
-                def _normalize_whitespace(s: str) -> str:
-                    return re.sub(r'\s+', ' ', s).strip()
-
-                def _get_sql_for_existing_table(table_name: str) -> str:
-                    # TODO: is there a apsw method for this?
-                    query = f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table_name}'"
-                    cursor = self.connection.execute(query)
-                    result = cursor.fetchone()
-                    cursor.close()
-                    assert result is not None, f"Table {table_name} not found in sqlite_master"
-                    return result[0]
-
-                existing_table_schema = _normalize_whitespace(_get_sql_for_existing_table(meta.table_name))
-                new_table_schema = _normalize_whitespace(ddl)
-
-                if existing_table_schema != new_table_schema:
-                    raise TableSchemaMismatch(meta.table_name, existing_table_schema, new_table_schema) from e
-            else:
-                # error is not about the table already existing
-                raise
-        except Exception as e:
-            raise e
+        else:
+            existing_table_schema = _normalize_whitespace(existing[0][0])
+            new_table_schema = _normalized_create_table_ddl(Model)
+
+            if existing_table_schema != new_table_schema:
+                raise TableSchemaMismatch(meta.table_name, existing_table_schema, new_table_schema)
 
         self.adapt_convert_registry.register_adapt_convert(Model, adapt=lambda row: row.id, convert=lambda _id: _id)
 
+        # Build the per-model CRUD SQL and parameter adapter now so first use of the model doesn't pay for them
+        generate_select_by_id_sql(Model)
+        generate_insert_sql(Model)
+        generate_update_sql(Model)
+        generate_delete_sql(Model)
+        self.adapt_convert_registry.get_model_adapter(Model)
+
+        self._ensured_tables[Model] = self.connection.pragma("schema_version")
+
     ##### Reading
     def find[R: TableRow](self, Model: type[R], row_id: int | None) -> R:
-        """Find a row by its id. This is a special case of find_by."""
+        """Find a row by its id. Like find_by(Model, id=row_id), without the kwargs handling."""
         if row_id is None:
             raise IdNoneError("Cannot SELECT, id=None")
-        if not is_row_model(Model):
-            raise LookupByAdHocModelImpossible(Model.__name__)
+        try:
+            sql = self._select_by_id_sql[Model]
+        except KeyError:
+            if not is_row_model(Model):
+                raise LookupByAdHocModelImpossible(Model.__name__) from None
+            sql = self._select_by_id_sql[Model] = generate_select_by_id_sql(Model)
 
-        row = self.find_by(Model, id=row_id)
+        row = self._query_one(Model, sql, (row_id,))
 
         if row is None:
             raise RecordNotFoundError(f"Cannot SELECT, no row with id={row_id} in table `{Model.__name__}`")
 
         return row
 
+    def find_tree[R: TableRow](self, Model: type[R], row_id: int | None) -> R:
+        """Find a row by its id, like find, and load the rows it references of the same Model, recursively.
+
+        Self-referencing relations, e.g. a tree of parts, are fetched with a single recursive query
+        rather than one query per row as they are accessed.
+        """
+        if row_id is None:
+            raise IdNoneError("Cannot SELECT, id=None")
+        if not is_row_model(Model):
+            raise LookupByAdHocModelImpossible(Model.__name__)
+
+        rows: dict[int, R] = {row.id: row for row in self.query(Model, generate_select_tree_sql(Model), (row_id,))}  # ty:ignore[invalid-assignment]
+        if row_id not in rows:
+            raise RecordNotFoundError(f"Cannot SELECT, no row with id={row_id} in table `{Model.__name__}`")
+
+        self_fks = _self_fk_field_names(Model)
+        for row in rows.values():
+            row_vars = vars(row)
+            for name in self_fks:
+                related = row_vars[name]
+                if isinstance(related, Lazy):
+                    related.prime(rows)
+
+        return rows[row_id]
+
+    def find_many[R: TableRow](self, Model: type[R], row_ids: Iterable[int]) -> list[R]:
+        """Find rows by their ids, returned in the order of `row_ids`. Like find, but one SELECT per batch of ids.
+
+        Batches are padded with NULL, which never matches, up to the next of `ID_BATCH_SIZES`.
+        """
+        if not is_row_model(Model):
+            raise LookupByAdHocModelImpossible(Model.__name__)
+
+        row_ids = list(row_ids)
+        if None in row_ids:
+            raise IdNoneError("Cannot SELECT, id=None")
+
+        unique_ids = list(dict.fromkeys(row_ids))
+        max_batch = ID_BATCH_SIZES[-1]
+        found: dict[int, R] = {}
+        for start in range(0, len(unique_ids), max_batch):
+            batch = unique_ids[start : start + max_batch]
+            size = next(s for s in ID_BATCH_SIZES if s >= len(batch))
+            sql = generate_select_by_ids_sql(Model, size)
+            for row in self.query(Model, sql, (*batch, *(None,) * (size - len(batch)))):
+                assert row.id is not None
+                found[row.id] = row
+
+        missing = [row_id for row_id in unique_ids if row_id not in found]
+        if missing:
+            raise RecordNotFoundError(f"Cannot SELECT, no rows with id in {missing} in table `{Model.__name__}`")
+
+        return [found[row_id] for row_id in row_ids]
+
     def find_by[R: Row | TableRow](self, Model: type[R], **kwargs: Any) -> R | None:
         """Find a row by its fields, e.g. `find_by(Model, name="Alice")`"""
 
         if not kwargs:
             raise NoKwargFieldSpecifiedError()
 
-        cur = self.select(Model, **kwargs)
-        row = cur.fetchone()
-        cur.close()
-
-        return row
+        self._check_select_kwargs(Model, kwargs)
+        # LIMIT 1, so SQLite stops at the first match and the statement completes before returning
+        return self._query_one(Model, generate_select_by_field_sql(Model, frozenset(kwargs), 1), kwargs)
 
     def select[R: Row | TableRow](self, Model: type[R], **kwargs: Any) -> TypedCursorProxy[R]:
         """Select rows by fields, returning a cursor proxy.
@@ -170,25 +314,69 @@ class Engine:
         Like find_by, but returns a TypedCursorProxy[R] instead of a single row.
         """
 
-        meta = Model.meta
-
-        if meta.table_name is None:
-            raise LookupByAdHocModelImpossible(meta.model_name)
-
+        self._check_select_kwargs(Model, kwargs)
         if kwargs:
-            field_names = [f.name for f in meta.fields]
-            if not all(k in field_names for k in kwargs):
-                raise InvalidKwargFieldSpecifiedError(Model, kwargs)
-            sql: str = generate_select_by_field_sql(Model, frozenset(kwargs.keys()))  # typing see https://github.com/astral-sh/ty/issues/1179
+            sql: str = generate_select_by_field_sql(Model, frozenset(kwargs))  # typing see https://github.com/astral-sh/ty/issues/1179
         else:
             sql = generate_select_sql(Model)
 
         return self.query(Model, sql, kwargs)
 
+    def _check_select_kwargs(self, Model: type[Row | TableRow], kwargs: dict[str, Any]) -> None:
+        meta = Model.meta
+
+        if meta.table_name is None:
+            raise LookupByAdHocModelImpossible(meta.model_name)
+
+        if not kwargs.keys() <= meta.fields_by_name.keys():
+            raise InvalidKwargFieldSpecifiedError(Model, {k: v for k, v in kwargs.items() if k not in meta.fields_by_name})
+
     def query[R: Row | TableRow](self, Model: type[R], sql: str, parameters: Sequence | dict = tuple()) -> TypedCursorProxy[R]:
         cursor = self.connection.execute(sql, parameters)
         return TypedCursorProxy.proxy_cursor_lazy(Model, cursor, self)
 
+    def query_columns(self, Model: type[Row | TableRow], sql: str, parameters: Sequence | dict = tuple()) -> dict[str, list[Any]]:
+        """Like query, but returns each of `Model`'s fields as a list of values rather than a row per result.
+
+        For scanning or aggregating over many rows, no model instance is built per row. Values are
+        converted as query would, except foreign keys, which are left as ids rather than Lazy relations.
+        """
+        converters = self.adapt_convert_registry.field_converters(Model)
+
+        connection_exec_trace = self.connection.exec_trace
+
+        def check_column_count(cursor: apsw.Cursor, sql: str, bindings: Any) -> bool:
+            # Checked once the statement is prepared, before it runs, so a query returning no rows is caught too
+            if len(cursor.description) != len(converters):
+                raise ColumnCountMismatchError(Model, len(cursor.description))
+            # A cursor's exec_trace replaces the connection's, so pass the statement on to it, e.g. SqlLog
+            return connection_exec_trace(cursor, sql, bindings) if connection_exec_trace is not None else True
+
+        cursor = self.connection.cursor()
+        cursor.exec_trace = check_column_count
+        rows = cursor.execute(sql, parameters).fetchall()
+        columns = list(zip(*rows, strict=True)) if rows else [()] * len(converters)
+
+        result: dict[str, list[Any]] = {}
+        for field, convert, column in zip(Model.meta.fields, converters, columns, strict=True):
+            if convert is None or field.is_fk:
+                result[field.name] = list(column)
+            else:
+                result[field.name] = [convert(v) if v is not None else None for v in column]
+        return result
+
+    def _query_one[R: Row | TableRow](self, Model: type[R], sql: str, parameters: Sequence | dict) -> R | None:
+        """Like query, for statements returning at most one row.
+
+        The statement is run to completion, so it doesn't hold a read open after returning. These are the
+        per-model CRUD statements, which live in the statement cache for the life of the connection, so
+        they are prepared as persistent, keeping them out of SQLite's small lookaside memory pool. Each
+        call gets its own cursor, so threads sharing the Engine don't contend for one.
+        """
+        cursor = self.connection.cursor().execute(sql, parameters, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
+        rows = TypedCursorProxy.proxy_cursor_lazy(Model, cursor, self).fetchall()
+        return rows[0] if rows else None
+
     #### Writing
     def save[R: TableRow](self, row: R, *, force_insert: bool = False) -> R:
         """insert or update records, based on the presence of an id.
@@ -197,30 +385,112 @@ class Engine:
         This is useful for seeding data or restoring rows with known ids.
         """
 
-        # Don't allow saving if a related row is not persisted
-        for f in fields(row)[1:]:  # skip id field
-            related_row = getattr(row, f.name)
-            if is_row_model(related_row.__class__) and related_row.id is None:
-                raise UnpersistedRelationshipError(type(row).__name__, f.name, row)
-
         Model = type(row)
+        self._ensure_relations_persisted(row)
+        params = self.adapt_convert_registry.get_model_adapter(Model)(vars(row))
 
         if row.id is None or force_insert:
             insert = generate_insert_sql(Model)
-            cur = self.query(Model, insert, vars(row))
-            result = cur.fetchone()
-            cur.close()
+            result = self._query_one(Model, insert, params)
             assert result is not None  # INSERT always returns a row on success
             return result
         else:
             update = generate_update_sql(Model)
-            cur = self.query(Model, update, vars(row))
-            result = cur.fetchone()
-            cur.close()
+            result = self._query_one(Model, update, params)
             if result is None:
                 raise NoRecordToUpdateError(f"Cannot UPDATE, no row with id={row.id} in table `{Model.__name__}`")
             return result
 
+    def insert_many[R: TableRow](self, rows: Iterable[R]) -> list[R]:
+        """INSERT many rows in a single transaction, returning them with their ids filled in.
+
+        Consecutive rows of the same model share one `executemany` call. Like `save(row, force_insert=True)`,
+        rows which already have an id are inserted with that id. If any row fails, none are inserted.
+        """
+
+        rows = list(rows)
+        for row in rows:
+            self._ensure_relations_persisted(row)
+
+        results: list[R] = []
+        with self.transaction():
+            for Model, model_rows in groupby(rows, key=type):
+                results.extend(self._insert_fields(Model, map(vars, model_rows)))
+        return results
+
+    def _insert_fields[R: TableRow](self, Model: type[R], rows_fields: Iterable[dict[str, Any]]) -> TypedCursorProxy[R]:
+        """INSERT a row of `Model` per mapping of field name to value, with one `executemany`"""
+        insert = generate_insert_sql(Model)
+        adapt = self.adapt_convert_registry.get_model_adapter(Model)
+        cursor = self.connection.executemany(insert, map(adapt, rows_fields), prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
+        return TypedCursorProxy.proxy_cursor_lazy(Model, cursor, self)
+
+    def insert_tree[R: TableRow](self, root: R) -> R:
+        """INSERT `root` along with every unsaved row it references, directly or through other unsaved rows.
+
+        Rows are bucketed by their height in the tree, leaves first, and each level is one `executemany`
+        per model so every row's relations have ids by the time it is inserted. A row referenced more than once
+        is inserted once. All in a single transaction, returning the inserted `root`.
+        """
+
+        def unsaved_relations(row: TableRow) -> list[TableRow]:
+            related = (vars(row)[f.name] for f in type(row).meta.fields if f.is_fk)
+            return [r for r in related if isinstance(r, TableRow) and r.id is None]
+
+        # Iterative post-order walk, a row's height is one more than its highest unsaved relation
+        heights: dict[int, int] = {}
+        levels: list[list[TableRow]] = []
+        in_progress: set[int] = set()
+        stack: list[TableRow] = [root]
+        while stack:
+            row = stack[-1]
+            if id(row) in heights:
+                stack.pop()
+                continue
+            pending = [r for r in unsaved_relations(row) if id(r) not in heights]
+            if pending and id(row) not in in_progress:
+                in_progress.add(id(row))
+                stack.extend(pending)
+                continue
+            if pending:
+                raise ValueError(f"Cannot INSERT, unsaved rows of {type(row).__name__} reference each other in a cycle")
+            stack.pop()
+            height = max((heights[id(r)] + 1 for r in unsaved_relations(row)), default=0)
+            heights[id(row)] = height
+            if height == len(levels):
+                levels.append([])
+            levels[height].append(row)
+
+        # Each row's fields go straight to the INSERT with its relations swapped for their inserted rows,
+        # rather than building a copy of the row, relations are known to be persisted by construction.
+        inserted: dict[int, TableRow] = {}
+        with self.transaction():
+            for level in levels:
+                level.sort(key=lambda row: id(type(row)))  # so groupby sees each model once
+                for Model, model_rows in groupby(level, key=type):
+                    model_rows = list(model_rows)
+                    fks = [f.name for f in Model.meta.fields if f.is_fk]
+                    rows_fields = ({**vars(row), **{name: inserted[id(r)] for name in fks if id(r := vars(row)[name]) in inserted}} for row in model_rows)
+                    for row, inserted_row in zip(model_rows, self._insert_fields(Model, rows_fields), strict=True):
+                        inserted[id(row)] = inserted_row
+                        # Relations inserted here are already in hand, don't fetch them again when accessed
+                        for name in fks:
+                            related = inserted.get(id(vars(row)[name]))
+                            lazy = vars(inserted_row)[name]
+                            if related is not None and isinstance(lazy, Lazy):
+                                lazy.prime({related.id: related})
+
+        return inserted[id(root)]  # ty:ignore[invalid-return-type]
+
+    def _ensure_relations_persisted(self, row: TableRow) -> None:
+        """Don't allow saving if a related row is not persisted"""
+        # Read from __dict__, a `Lazy` relation is persisted by definition and shouldn't be fetched by getattr
+        values = vars(row)
+        for name in _fk_field_names(type(row)):
+            related_row = values[name]
+            if isinstance(related_row, TableRow) and related_row.id is None:
+                raise UnpersistedRelationshipError(type(row).meta.model_name, name, row)
+
     @overload
     def update[R: TableRow](self, Model: type[R], row_id: int | None, **kwargs: Any) -> R: ...
 
@@ -243,15 +513,11 @@ class Engine:
         if not kwargs:
             raise NoKwargFieldSpecifiedError()
 
-        field_names = {f.name for f in Model.meta.fields}
-        invalid_kwargs = {k: v for k, v in kwargs.items() if k not in field_names}
-        if invalid_kwargs:
-            raise InvalidKwargFieldSpecifiedError(Model, invalid_kwargs)
+        if not kwargs.keys() <= Model.meta.fields_by_name.keys():
+            raise InvalidKwargFieldSpecifiedError(Model, {k: v for k, v in kwargs.items() if k not in Model.meta.fields_by_name})
 
-        sql = generate_update_set_fields_sql(Model, frozenset(kwargs.keys()))
-        cur = self.query(Model, sql, {**kwargs, 'id': row_id})
-        result = cur.fetchone()
-        cur.close()
+        sql = generate_update_set_fields_sql(Model, tuple(kwargs))
+        result = self._query_one(Model, sql, (*kwargs.values(), row_id))
         if result is None:
             raise NoRecordToUpdateError(f"Cannot UPDATE, no row with id={row_id} in table `{Model.__name__}`")
         return result
@@ -274,7 +540,7 @@ class Engine:
         if row_id is None:
             raise IdNoneError("Cannot DELETE, id=None")
         query = generate_delete_sql(Model)
-        self.connection.execute(query, {'id': row_id})
+        self.connection.cursor().execute(query, {'id': row_id}, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
         if self.connection.changes() == 0:
             raise NoRecordToDeleteError(f"Cannot DELETE, no row with id={row_id} in table `{Model.__name__}`")
 
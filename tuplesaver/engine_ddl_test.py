@@ -6,6 +6,7 @@ from typing import Any
 
 import pytest
 
+from .conftest import SqlLog
 from .engine import Engine, TableSchemaMismatch
 from .model import InvalidTableName, Row, TableRow
 
@@ -88,30 +89,15 @@ def test_ensure_table_created(engine: Engine) -> None:
     assert cols[7] == TableInfo(7, "serial", "INTEGER", 0, None, 0)  # optional field
 
 
-def test_ensure_table_created_with_related_table(engine: Engine) -> None:
+@pytest.mark.parametrize(("optional", "expected_notnull"), [(False, 1), (True, 0)])
+def test_ensure_table_created_with_related_table(engine: Engine, optional: bool, expected_notnull: int) -> None:
     class A(TableRow):
         pass
 
-    class B(TableRow):
-        team: A
-
-    engine.ensure_table_created(A)
-    engine.ensure_table_created(B)
-
-    cols = engine.query(TableInfo, f"PRAGMA table_info({B.__name__})").fetchall()
-
-    assert len(cols) == len(fields(B))
-
-    assert cols[0] == TableInfo(0, "id", "INTEGER", 1, None, 1)
-    assert cols[1] == TableInfo(1, "team", "A_ID", 1, None, 0)
-
-
-def test_ensure_table_created_with_optional_related_table(engine: Engine) -> None:
-    class A(TableRow):
-        pass
+    TeamType = A | None if optional else A
 
     class B(TableRow):
-        team: A | None  # Optional relationship
+        team: TeamType  # ty:ignore[invalid-type-form]
 
     engine.ensure_table_created(A)
     engine.ensure_table_created(B)
@@ -121,7 +107,7 @@ def test_ensure_table_created_with_optional_related_table(engine: Engine) -> Non
     assert len(cols) == len(fields(B))
 
     assert cols[0] == TableInfo(0, "id", "INTEGER", 1, None, 1)
-    assert cols[1] == TableInfo(1, "team", "A_ID", 0, None, 0)
+    assert cols[1] == TableInfo(1, "team", "A_ID", expected_notnull, None, 0)
 
 
 def test_ensure_table_created_with_table_already_created_correct_is_silent(engine: Engine) -> None:
@@ -162,6 +148,64 @@ def test_ensure_table_created_catches_mismatched_from_out_of_band_alters(engine:
         engine.ensure_table_created(TblAlreadyCreated)
 
 
+def test_ensure_table_created__existing_table_differs_in_case__raises(engine: Engine) -> None:
+    class Tbl(TableRow):
+        name: str
+
+    class Upper(TableRow):
+        __tablename__ = "TBL"
+        name: str
+
+    engine.ensure_table_created(Tbl)
+
+    with pytest.raises(TableSchemaMismatch):
+        engine.ensure_table_created(Upper)
+
+
+def test_ensure_table_created__repeat_call__skips_ddl(engine: Engine, sql_log: SqlLog) -> None:
+    class Tbl(TableRow):
+        name: str
+
+    engine.ensure_table_created(Tbl)
+    sql_log.clear()
+
+    engine.ensure_table_created(Tbl)
+
+    assert sql_log.entrys == ['pragma "schema_version"']  # the memo check alone, no sqlite_schema lookup or DDL
+
+
+def test_ensure_table_created__recheck__keeps_cached_row_trace(engine: Engine) -> None:
+    class Tbl(TableRow):
+        name: str
+
+    engine.ensure_table_created(Tbl)
+    engine.select(Tbl).fetchall()
+    row_trace = engine.adapt_convert_registry.model_row_traces[Tbl]
+
+    engine.connection.execute("CREATE TABLE Unrelated (x)")  # changes the schema_version, so Tbl is checked again
+    engine.ensure_table_created(Tbl)
+
+    assert engine.adapt_convert_registry.model_row_traces[Tbl] is row_trace
+
+
+def test_ensure_table_created__after_rollback__recreates(engine: Engine) -> None:
+    class Tbl(TableRow):
+        name: str
+
+    class Other(TableRow):
+        name: str
+
+    with pytest.raises(ZeroDivisionError), engine.transaction():
+        engine.ensure_table_created(Tbl)
+        1 / 0  # noqa: B018
+
+    # schema_version is back where it was, and Other's CREATE bumps it to what Tbl last saw
+    engine.ensure_table_created(Other)
+    engine.ensure_table_created(Tbl)
+
+    assert engine.connection.table_exists(None, "Tbl")
+
+
 def test_ensure_table_created__nontable_model_raises(engine: Engine) -> None:
     class NonTable_Model(TableRow):
         name: str
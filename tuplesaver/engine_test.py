@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import datetime as dt
+import random
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
+from pathlib import Path
+from string import ascii_uppercase
 
 import apsw
 import pytest
 from pytest_benchmark.fixture import BenchmarkFixture
 
+from .conftest import SqlLog
 from .engine import (
+    ColumnCountMismatchError,
     Engine,
     IdNoneError,
     InvalidKwargFieldSpecifiedError,
@@ -51,6 +58,73 @@ def test_engine_connection(engine: Engine) -> None:
     hasattr(engine.connection, "execute")
 
 
+def test_engine_connection__tuned_on_open(tmp_path: Path) -> None:
+    engine = Engine(tmp_path / "db.sqlite")
+
+    assert engine.connection.pragma("synchronous") == 2  # FULL, rollback journal
+    assert engine.connection.pragma("busy_timeout") == 5000
+    assert engine.connection.pragma("cache_size") == -65536
+    assert engine.connection.pragma("temp_store") == 2  # MEMORY
+
+    engine = Engine(tmp_path / "db.sqlite", durability="normal")
+
+    assert engine.connection.pragma("synchronous") == 1  # NORMAL
+
+
+def test_engine_connection__wal_database__normal_durability(tmp_path: Path) -> None:
+    Engine(tmp_path / "db.sqlite").connection.pragma("journal_mode", "wal")  # persists in the file
+
+    engine = Engine(tmp_path / "db.sqlite")
+
+    assert engine.connection.pragma("synchronous") == 1  # NORMAL
+
+    engine = Engine(tmp_path / "db.sqlite", durability="full")
+
+    assert engine.connection.pragma("synchronous") == 2  # FULL
+
+
+def test_engine_connection__passed_connection_untouched() -> None:
+    connection = apsw.Connection(":memory:")
+    engine = Engine(connection)
+
+    assert engine.connection is connection
+    assert engine.connection.pragma("busy_timeout") == 0
+
+
+def test_engine_statements__prepared_once(tmp_path: Path) -> None:
+    engine = Engine(tmp_path / "db.sqlite")
+    engine.ensure_table_created(Team)
+    row = engine.save(Team("Lions", 30))
+    engine.update(engine.save(replace(engine.find(Team, row.id), size=31)), size=32)
+    engine.find_by(Team, name="Lions")
+    engine.delete(row)
+    misses = engine.connection.cache_stats()["misses"]
+
+    for size in range(10):
+        row = engine.save(Team("Tigers", size))
+        engine.update(engine.save(replace(engine.find(Team, row.id), size=31)), size=32)
+        engine.find_by(Team, name="Tigers")
+        engine.delete(row)
+
+    assert engine.connection.cache_stats()["misses"] == misses
+
+
+def test_engine_read_only(tmp_path: Path) -> None:
+    writer = Engine(tmp_path / "db.sqlite")
+    writer.ensure_table_created(Team)
+    row = writer.save(Team("Lions", 30))
+
+    reader = Engine(tmp_path / "db.sqlite", read_only=True)
+    reader.ensure_table_created(Team)  # existing table is only checked
+
+    assert reader.find(Team, row.id) == row
+    with pytest.raises(apsw.ReadOnlyError):
+        reader.save(Team("Tigers", 33))
+    with pytest.raises(apsw.ReadOnlyError):
+        reader.ensure_table_created(Person)
+
+
+@pytest.mark.shared_engine
 def test_find__by_id(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = Team("Lions", 30)
@@ -63,39 +137,107 @@ def test_find__by_id(engine: Engine) -> None:
     assert type(retrieved_row) is Team
 
 
-def test_find__benchmark(engine: Engine, benchmark: BenchmarkFixture) -> None:
+def test_find__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
     engine.ensure_table_created(Team)
     engine.save(Team("Lions", 30))
 
     def find():
         engine.find(Team, 1)
 
-    benchmark(find)
+    # a single find is a few µs, batch many per round so timer and bracketing overhead averages out
+    benchmark.pedantic(find, rounds=100, iterations=100, warmup_rounds=10)
 
 
+@pytest.mark.shared_engine
 def test_find__id_is_none(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(IdNoneError, match="Cannot SELECT, id=None"):
         engine.find(Team, None)
 
 
+@pytest.mark.shared_engine
 def test_find__id_no_match(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(RecordNotFoundError, match="Cannot SELECT, no row with id="):
         engine.find(Team, 78787)
 
 
+@pytest.mark.shared_engine
 def test_find__adhoc_model(engine: Engine) -> None:
     with pytest.raises(LookupByAdHocModelImpossible, match="Cannot lookup via adhoc model: `AdHoc`"):
         engine.find(AdHoc, 1)  # ty:ignore[invalid-argument-type]
 
 
+@pytest.mark.shared_engine
+def test_find__while_iterating_select(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.insert_many([Team("Lions", 30), Team("Tigers", 33)])
+
+    rows = [(row, engine.find(Team, row.id)) for row in engine.select(Team)]
+
+    assert [found for _, found in rows] == [row for row, _ in rows]
+
+
+def test_find__threads_sharing_engine(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    rows = engine.insert_many([Team(name, 30) for name in ascii_uppercase])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        found = list(pool.map(lambda row: engine.find(Team, row.id), rows * 200))
+
+    assert found == rows * 200
+
+
+@pytest.mark.shared_engine
+def test_find_many__in_order_of_ids(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    r1 = engine.save(Team("Lions", 30))
+    r2 = engine.save(Team("Tigers", 33))
+    r3 = engine.save(Team("Bears", 25))
+
+    assert engine.find_many(Team, [r3.id, r1.id, r3.id]) == [r3, r1, r3]  # ty:ignore[invalid-argument-type]
+    assert engine.find_many(Team, iter([r2.id])) == [r2]  # ty:ignore[invalid-argument-type]
+    assert engine.find_many(Team, []) == []
+
+
+@pytest.mark.shared_engine
+def test_find_many__across_batches(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    rows = engine.insert_many(Team(f"Team {i}", i) for i in range(1500))
+    ids = [row.id for row in reversed(rows)]
+
+    assert engine.find_many(Team, ids) == rows[::-1]  # ty:ignore[invalid-argument-type]
+
+
+@pytest.mark.shared_engine
+def test_find_many__id_no_match(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    row = engine.save(Team("Lions", 30))
+
+    with pytest.raises(RecordNotFoundError, match=r"Cannot SELECT, no rows with id in \[78787\]"):
+        engine.find_many(Team, [row.id, 78787])  # ty:ignore[invalid-argument-type]
+
+
+@pytest.mark.shared_engine
+def test_find_many__id_is_none(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    with pytest.raises(IdNoneError, match="Cannot SELECT, id=None"):
+        engine.find_many(Team, [1, None])  # ty:ignore[invalid-argument-type]
+
+
+@pytest.mark.shared_engine
+def test_find_many__adhoc_model(engine: Engine) -> None:
+    with pytest.raises(LookupByAdHocModelImpossible, match="Cannot lookup via adhoc model: `AdHoc`"):
+        engine.find_many(AdHoc, [1])  # ty:ignore[invalid-argument-type]
+
+
+@pytest.mark.shared_engine
 def test_find_by__field(engine: Engine) -> None:
     # one field
     engine.ensure_table_created(Team)
 
-    engine.save(Team("Lions", 30))
-    engine.save(Team("Tigers", 33))
+    engine.insert_many([Team("Lions", 30), Team("Tigers", 33)])
 
     found = engine.find_by(Team, name="Lions")
     assert isinstance(found, Team)
@@ -106,15 +248,16 @@ def test_find_by__field(engine: Engine) -> None:
     assert engine.find_by(Team, size=33) == Team("Tigers", 33, id=2)
 
 
+@pytest.mark.shared_engine
 def test_find_by__field_no_match(engine: Engine) -> None:
     engine.ensure_table_created(Team)
 
-    engine.save(Team("Lions", 30))
-    engine.save(Team("Tigers", 33))
+    engine.insert_many([Team("Lions", 30), Team("Tigers", 33)])
 
     assert engine.find_by(Team, name="Karl") is None
 
 
+@pytest.mark.shared_engine
 def test_find_by__fields(engine: Engine) -> None:
     # multiple fields
     engine.ensure_table_created(Team)
@@ -127,16 +270,19 @@ def test_find_by__fields(engine: Engine) -> None:
     assert engine.find_by(Team, name="Lions", size=33) == r3
 
 
+@pytest.mark.shared_engine
 def test_find_by__fields_with_no_kwargs(engine: Engine) -> None:
     with pytest.raises(NoKwargFieldSpecifiedError, match=r"At least one field must be specified to find a row\."):
         engine.find_by(Team)
 
 
+@pytest.mark.shared_engine
 def test_find_by__fields_with_invalid_kwargs(engine: Engine) -> None:
     with pytest.raises(InvalidKwargFieldSpecifiedError):
         engine.find_by(Team, doesnt_exist="test")
 
 
+@pytest.mark.shared_engine
 def test_find_by__adhoc_model(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     r = engine.find_by(SqliteMaster, type='table')
@@ -145,11 +291,10 @@ def test_find_by__adhoc_model(engine: Engine) -> None:
     assert r.name == 'Team'
 
 
+@pytest.mark.shared_engine
 def test_select__returns_all_rows(engine: Engine) -> None:
     engine.ensure_table_created(Team)
-    engine.save(Team("Lions", 30))
-    engine.save(Team("Tigers", 33))
-    engine.save(Team("Bears", 25))
+    engine.insert_many([Team("Lions", 30), Team("Tigers", 33), Team("Bears", 25)])
 
     rows = engine.select(Team).fetchall()
 
@@ -160,11 +305,10 @@ def test_select__returns_all_rows(engine: Engine) -> None:
     assert rows[2] == Team("Bears", 25, id=3)
 
 
+@pytest.mark.shared_engine
 def test_select__with_kwargs_filters(engine: Engine) -> None:
     engine.ensure_table_created(Team)
-    engine.save(Team("Lions", 30))
-    engine.save(Team("Tigers", 33))
-    engine.save(Team("Lions", 25))
+    engine.insert_many([Team("Lions", 30), Team("Tigers", 33), Team("Lions", 25)])
 
     rows = engine.select(Team, name="Lions").fetchall()
 
@@ -173,6 +317,7 @@ def test_select__with_kwargs_filters(engine: Engine) -> None:
     assert rows[1] == Team("Lions", 25, id=3)
 
 
+@pytest.mark.shared_engine
 def test_select__with_kwargs_no_match(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     engine.save(Team("Lions", 30))
@@ -182,12 +327,20 @@ def test_select__with_kwargs_no_match(engine: Engine) -> None:
     assert rows == []
 
 
+@pytest.mark.shared_engine
 def test_select__invalid_kwargs(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(InvalidKwargFieldSpecifiedError):
         engine.select(Team, doesnt_exist="test")
 
+    with pytest.raises(InvalidKwargFieldSpecifiedError, match=r"Invalid fields for Team: doesnt_exist\. Valid"):
+        engine.select(Team, name="Lions", doesnt_exist="test")
 
+    with pytest.raises(InvalidKwargFieldSpecifiedError, match=r"Invalid fields for Team: zzz, aaa\. Valid"):
+        engine.select(Team, zzz="test", name="Lions", aaa="test")
+
+
+@pytest.mark.shared_engine
 def test_select__adhoc_model(engine: Engine) -> None:
     r = engine.select(SqliteMaster, type='table').fetchall()
     assert len(r) == 0
@@ -216,6 +369,42 @@ def test_query__adhoc_model__succeeds_with_returns_cursor_proxy(engine: Engine)
     assert row == AdHoc(7.7)
 
 
+def test_query_columns__returns_converted_columns(engine: Engine) -> None:
+    class Event(TableRow):
+        day: dt.date
+        team: Team | None
+
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Event)
+    team = engine.save(Team("Lions", 30))
+    engine.save(Event(dt.date(2020, 1, 2), team))
+    engine.save(Event(dt.date(2020, 1, 3), None))
+
+    columns = engine.query_columns(Event, "SELECT * FROM Event ORDER BY id;")
+
+    assert columns == {"id": [1, 2], "day": [dt.date(2020, 1, 2), dt.date(2020, 1, 3)], "team": [team.id, None]}
+
+
+def test_query_columns__no_rows(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+
+    assert engine.query_columns(Team, "SELECT * FROM Team;") == {"id": [], "name": [], "size": []}
+
+
+def test_query_columns__column_count_mismatch__raises(engine: Engine) -> None:
+    with pytest.raises(ColumnCountMismatchError, match="Query returns 2 columns, but AdHoc has 1 fields"):
+        engine.query_columns(AdHoc, "SELECT 7.7 as score, 1 as extra;")
+
+    with pytest.raises(ColumnCountMismatchError):
+        engine.query_columns(AdHoc, "SELECT 7.7 as score, 1 as extra WHERE 0;")
+
+
+def test_query_columns__connection_exec_trace__still_sees_statement(engine: Engine, sql_log: SqlLog) -> None:
+    engine.query_columns(AdHoc, "SELECT 7.7 as score;")
+
+    assert sql_log.entrys == ["SELECT 7.7 as score;"]
+
+
 def test_save__on_success__inserts_record_to_db(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -240,14 +429,29 @@ def test_save__on_success__returns_model_with_filled_in_id(engine: Engine) -> No
     assert returned_row.id == 2
 
 
-def test_save__benchmark(engine: Engine, benchmark: BenchmarkFixture) -> None:
+def test_save__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
     engine.ensure_table_created(Team)
     row = Team("Lions", 30)
 
     def save():
         engine.save(row)
 
-    benchmark(save)
+    # like find, a single autocommitted insert is only a few µs, batch many per round
+    benchmark.pedantic(save, rounds=200, iterations=100, warmup_rounds=5)
+
+
+def test_save__in_transaction__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
+    engine.ensure_table_created(Team)
+    rows = [Team("Lions", 30)] * 100
+
+    def save_in_transaction():
+        with engine.transaction():
+            for row in rows:
+                engine.save(row)
+
+    benchmark(save_in_transaction)
 
 
 def test_save__nonexistent_id(engine: Engine) -> None:
@@ -328,6 +532,30 @@ def test_save__updates_row(engine: Engine) -> None:
     assert retrieved_row == Team("Alice", 30, id=row.id)
 
 
+def test_save__updates_row__relation_not_fetched(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+    team = engine.save(Team("Lions", 30))
+    person = engine.save(Person("Alice", team))
+
+    found = engine.find(Person, person.id)
+    engine.save(found)
+
+    # the Lazy relation binds its id as is, without fetching the Team
+    assert "pending" in repr(vars(found)["team"])
+    assert engine.find(Person, person.id) == person
+
+
+def test_save__updates_row__id_only_model(engine: Engine) -> None:
+    class OnlyId(TableRow):
+        pass
+
+    engine.ensure_table_created(OnlyId)
+    row = engine.save(OnlyId())
+
+    assert engine.save(row) == row
+
+
 def test_save__force_insert__with_explicit_id(engine: Engine) -> None:
     """force_insert=True inserts a row even when id is set."""
     engine.ensure_table_created(Team)
@@ -366,6 +594,95 @@ def test_save__force_insert__multiple_explicit_ids(engine: Engine) -> None:
     assert engine.find(Team, 20) == Team("Tigers", 50, id=20)
 
 
+def test_transaction__commits(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+
+    with engine.transaction() as e:
+        assert e is engine
+        assert engine.connection.in_transaction
+        engine.save(Team("Lions", 30))
+        engine.save(Team("Tigers", 33))
+
+    assert not engine.connection.in_transaction
+    assert len(engine.select(Team).fetchall()) == 2
+
+
+def test_transaction__exception__rolls_back(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    transaction_mode = engine.connection.transaction_mode
+
+    with pytest.raises(ZeroDivisionError), engine.transaction():
+        engine.save(Team("Lions", 30))
+        1 / 0  # noqa: B018
+
+    assert engine.select(Team).fetchall() == []
+    assert engine.connection.transaction_mode == transaction_mode
+
+
+def test_transaction__nested__rolls_back_inner_only(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+
+    with engine.transaction():
+        lions = engine.save(Team("Lions", 30))
+        with pytest.raises(ZeroDivisionError), engine.transaction():
+            engine.save(Team("Tigers", 33))
+            1 / 0  # noqa: B018
+
+    assert engine.select(Team).fetchall() == [lions]
+
+
+def test_insert_many__returns_rows_with_ids(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+
+    rows = engine.insert_many([Team("Lions", 30), Team("Tigers", 33), Team("Bears", 25, id=10)])
+
+    assert rows == [Team("Lions", 30, id=1), Team("Tigers", 33, id=2), Team("Bears", 25, id=10)]
+    assert engine.select(Team).fetchall() == rows
+
+
+def test_insert_many__mixed_models__keeps_order(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+    team = engine.save(Team("Lions", 30))
+
+    rows = engine.insert_many([Person("Alice", team), Person("Bob", team), Team("Tigers", 33), Person("Carol", team)])
+
+    assert rows == [Person("Alice", team, id=1), Person("Bob", team, id=2), Team("Tigers", 33, id=2), Person("Carol", team, id=3)]
+
+
+def test_insert_many__empty(engine: Engine) -> None:
+    assert engine.insert_many([]) == []
+
+
+def test_insert_many__failure__inserts_nothing(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+
+    with pytest.raises(apsw.ConstraintError):
+        engine.insert_many([Team("Lions", 30, id=1), Team("Tigers", 33, id=1)])
+
+    assert engine.select(Team).fetchall() == []
+
+
+def test_insert_many__unpersisted_relation__raises(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+
+    with pytest.raises(UnpersistedRelationshipError):
+        engine.insert_many([Person("Alice", Team("Lions", 5))])
+
+
+def test_insert_many__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
+    engine.ensure_table_created(Team)
+    rows = [Team("Lions", 30)] * 100
+
+    def insert_many():
+        engine.insert_many(rows)
+
+    benchmark(insert_many)
+
+
+@pytest.mark.shared_engine
 def test_delete__by_id(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -383,6 +700,7 @@ def test_delete__by_id(engine: Engine) -> None:
     assert len(rows) == 0
 
 
+@pytest.mark.shared_engine
 def test_delete__by_row(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -400,12 +718,14 @@ def test_delete__by_row(engine: Engine) -> None:
     assert len(rows) == 0
 
 
+@pytest.mark.shared_engine
 def test_delete__nonexistent_id(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(NoRecordToDeleteError, match="Cannot DELETE, no row with id="):
         engine.delete(Team, 78787)
 
 
+@pytest.mark.shared_engine
 def test_delete__id_none(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(IdNoneError, match="Cannot DELETE, id=None"):
@@ -415,6 +735,7 @@ def test_delete__id_none(engine: Engine) -> None:
 # ---- update ----
 
 
+@pytest.mark.shared_engine
 def test_update__by_model_and_id(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -425,6 +746,7 @@ def test_update__by_model_and_id(engine: Engine) -> None:
     assert engine.find(Team, row.id) == Team("Tigers", 30, id=row.id)
 
 
+@pytest.mark.shared_engine
 def test_update__by_instance(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -435,6 +757,7 @@ def test_update__by_instance(engine: Engine) -> None:
     assert engine.find(Team, row.id) == Team("Tigers", 30, id=row.id)
 
 
+@pytest.mark.shared_engine
 def test_update__multiple_fields(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -444,24 +767,28 @@ def test_update__multiple_fields(engine: Engine) -> None:
     assert updated == Team("Tigers", 50, id=row.id)
 
 
+@pytest.mark.shared_engine
 def test_update__id_none(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(IdNoneError, match="Cannot UPDATE, id=None"):
         engine.update(Team, None, name="Tigers")
 
 
+@pytest.mark.shared_engine
 def test_update__id_none_instance(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(IdNoneError, match="Cannot UPDATE, id=None"):
         engine.update(Team("Lions", 30), name="Tigers")
 
 
+@pytest.mark.shared_engine
 def test_update__nonexistent_id(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     with pytest.raises(NoRecordToUpdateError, match="Cannot UPDATE, no row with id="):
         engine.update(Team, 78787, name="Tigers")
 
 
+@pytest.mark.shared_engine
 def test_update__no_kwargs(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
@@ -469,8 +796,238 @@ def test_update__no_kwargs(engine: Engine) -> None:
         engine.update(row)
 
 
+@pytest.mark.shared_engine
 def test_update__invalid_kwargs(engine: Engine) -> None:
     engine.ensure_table_created(Team)
     row = engine.save(Team("Lions", 30))
-    with pytest.raises(InvalidKwargFieldSpecifiedError):
-        engine.update(row, doesnt_exist="test")
+    with pytest.raises(InvalidKwargFieldSpecifiedError, match=r"Invalid fields for Team: zzz, aaa\."):
+        engine.update(row, zzz="test", name="Tigers", aaa="test")
+
+
+#### Self join, bill of materials
+class BOM(TableRow):
+    name: str
+    value: float
+    part1: BOM | None
+    part2: BOM | None
+
+
+def make_bom(depth: int) -> BOM:
+    """Build, but don't save, a complete binary tree of `depth` levels of parts, returning the root.
+
+    Built bottom up a level at a time, without recursion. Names are drawn in a single call up front.
+    """
+    rng = random.Random(depth)
+    letters = "".join(rng.choices(ascii_uppercase, k=3 * 2**depth))
+    names = iter([letters[i : i + 3] for i in range(0, len(letters), 3)])
+    level: list[BOM | None] = [None] * 2**depth
+    for _ in range(depth):
+        level = [BOM(next(names), rng.uniform(-500, 500), level[i], level[i + 1]) for i in range(0, len(level), 2)]
+    (root,) = level
+    assert root is not None
+    return root
+
+
+def make_linear_bom(length: int) -> BOM:
+    """Build, but don't save, a chain of `length` parts each made of the next, returning the first"""
+    part = None
+    for i in range(length):
+        part = BOM(f"P{i}", float(i), part, None)
+    assert part is not None
+    return part
+
+
+def create_bom(engine: Engine, depth: int) -> BOM:
+    """Save a complete binary tree of `depth` levels of parts, returning the root"""
+    return engine.insert_tree(make_bom(depth))
+
+
+def get_bom_parts(root: BOM) -> list[BOM]:
+    """All parts of the tree under `root`, depth first, loading each lazily"""
+    parts = []
+    stack = [root]
+    while stack:
+        part = stack.pop()
+        parts.append(part)
+        stack.extend(p for p in (part.part2, part.part1) if p is not None)
+    return parts
+
+
+def test_bom__self_join(engine: Engine) -> None:
+    engine.ensure_table_created(BOM)
+    root = create_bom(engine, 4)
+
+    parts = get_bom_parts(engine.find(BOM, root.id))
+
+    assert len(parts) == 2**4 - 1
+    assert parts[0] == root
+    assert sorted(p.id for p in parts) == [p.id for p in engine.select(BOM)]
+    assert sum(p.value for p in parts) == pytest.approx(sum(p.value for p in engine.select(BOM)))
+
+
+@pytest.mark.usefixtures("limit_stack_depth")
+def test_bom__linear__no_recursion(engine: Engine) -> None:
+    engine.ensure_table_created(BOM)
+
+    root = engine.insert_tree(make_linear_bom(1500))
+
+    assert len(get_bom_parts(engine.find(BOM, root.id))) == 1500
+    assert len(get_bom_parts(engine.find_tree(BOM, root.id))) == 1500
+
+
+def test_insert_tree(engine: Engine, sql_log: SqlLog) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+    engine.ensure_table_created(Arm)
+    lions = Team("Lions", 30)
+    alice = Person("Alice", lions)
+    sql_log.clear()
+
+    arm = engine.insert_tree(Arm(1.5, alice))
+
+    assert arm.id is not None
+    assert arm.person.id is not None
+    assert arm.person.team.id is not None
+    assert engine.find(Arm, arm.id) == arm
+    assert sum("INSERT" in entry for entry in sql_log.entrys) == 3
+
+
+def test_insert_tree__relations_not_fetched_again(engine: Engine, sql_log: SqlLog) -> None:
+    engine.ensure_table_created(BOM)
+    root = engine.insert_tree(make_bom(3))
+    sql_log.clear()
+
+    assert len(get_bom_parts(root)) == 2**3 - 1
+    assert sql_log.entrys == []
+
+
+def test_insert_tree__shared_and_saved_rows(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+    engine.ensure_table_created(Arm)
+    tigers = engine.save(Team("Tigers", 33))
+    alice = Person("Alice", Team("Lions", 30))
+    bob = Person("Bob", tigers)
+
+    left = engine.insert_tree(Arm(1.5, alice))
+    right = engine.insert_tree(Arm(1.6, bob))
+
+    assert right.person.team == tigers
+    assert len(engine.select(Team).fetchall()) == 2
+    assert left.person.team.name == "Lions"
+
+
+def test_insert_tree__bom_shares_parts(engine: Engine) -> None:
+    engine.ensure_table_created(BOM)
+    screw = BOM("screw", 0.1, None, None)
+    bracket = BOM("bracket", 1.0, screw, screw)
+
+    root = engine.insert_tree(BOM("shelf", 5.0, bracket, screw))
+
+    assert len(engine.select(BOM).fetchall()) == 3
+    assert root.part1 is not None and root.part2 is not None
+    assert root.part1.part1 == root.part2
+
+
+def test_insert_tree__cycle__raises(engine: Engine) -> None:
+    engine.ensure_table_created(BOM)
+    a = BOM("a", 1.0, None, None)
+    b = BOM("b", 1.0, a, None)
+    a.part1 = b
+
+    with pytest.raises(ValueError, match="cycle"):
+        engine.insert_tree(a)
+    assert engine.select(BOM).fetchall() == []
+
+
+def test_insert_tree__failure__inserts_nothing(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    engine.ensure_table_created(Person)
+    engine.ensure_table_created(Arm)
+
+    with pytest.raises(apsw.ConstraintError):
+        engine.insert_tree(Arm(None, Person("Alice", Team("Lions", 30))))  # ty:ignore[invalid-argument-type]
+
+    assert engine.select(Team).fetchall() == []
+    assert engine.select(Person).fetchall() == []
+
+
+def test_bom__find_tree(engine: Engine, sql_log: SqlLog) -> None:
+    engine.ensure_table_created(BOM)
+    root = create_bom(engine, 4)
+    sql_log.clear()
+
+    parts = get_bom_parts(engine.find_tree(BOM, root.id))
+
+    assert len(sql_log.entrys) == 1
+    assert len(parts) == 2**4 - 1
+    assert parts == get_bom_parts(engine.find(BOM, root.id))
+
+
+def test_bom__find_tree__subtree(engine: Engine) -> None:
+    engine.ensure_table_created(BOM)
+    root = create_bom(engine, 4)
+    assert root.part1 is not None
+
+    parts = get_bom_parts(engine.find_tree(BOM, root.part1.id))
+
+    assert len(parts) == 2**3 - 1
+    assert root not in parts
+
+
+def test_bom__find_tree__id_no_match(engine: Engine) -> None:
+    engine.ensure_table_created(BOM)
+    with pytest.raises(RecordNotFoundError, match="Cannot SELECT, no row with id="):
+        engine.find_tree(BOM, 78787)
+
+
+def test_find_tree__no_self_reference(engine: Engine) -> None:
+    engine.ensure_table_created(Team)
+    row = engine.save(Team("Lions", 30))
+
+    assert engine.find_tree(Team, row.id) == row
+
+
+def test_bom__insert__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
+    engine.ensure_table_created(BOM)
+
+    def build_bom():
+        # Building the 127 part tree is setup, only the insert is timed
+        return (make_bom(7),), {}
+
+    benchmark.pedantic(engine.insert_tree, setup=build_bom, rounds=100, warmup_rounds=10)
+
+
+def test_bom__insert__in_transaction__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
+    engine.ensure_table_created(BOM)
+
+    def build_bom():
+        return (make_bom(7),), {}
+
+    # One outer transaction for the whole run, each insert_tree becomes a savepoint, leaving out the commit
+    with engine.transaction():
+        benchmark.pedantic(engine.insert_tree, setup=build_bom, rounds=100, warmup_rounds=10)
+
+
+def test_bom__get__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
+    engine.ensure_table_created(BOM)
+    root = create_bom(engine, 7)
+
+    def get_bom():
+        get_bom_parts(engine.find(BOM, root.id))
+
+    benchmark(get_bom)
+
+
+def test_bom__find_tree__benchmark(file_engine: Engine, benchmark: BenchmarkFixture) -> None:
+    engine = file_engine
+    engine.ensure_table_created(BOM)
+    root = create_bom(engine, 7)
+
+    def find_tree():
+        get_bom_parts(engine.find_tree(BOM, root.id))
+
+    benchmark(find_tree)
@@ -302,7 +302,7 @@ class Migrate:
         """Get applied migrations as {id: (filename, script)} from _migrations table."""
         self._ensure_migrations_table()
         cur = self.engine.select(Migration)
-        return {row.id: (row.filename, row.script) for row in cur.fetchall()}  # type: ignore[dict-item-type]
+        return {row.id: (row.filename, row.script) for row in cur}  # type: ignore[dict-item-type]
 
     def _get_ref_applied_migrations(self) -> dict[int, tuple[str, str]]:
         """Get applied migrations from the .ref DB as {id: (filename, script)}.
@@ -317,7 +317,7 @@ class Migrate:
             return {}
 
         cur = ref_engine.select(Migration)
-        return {row.id: (row.filename, row.script) for row in cur.fetchall()}  # type: ignore[dict-item-type]
+        return {row.id: (row.filename, row.script) for row in cur}  # type: ignore[dict-item-type]
 
     def _validate_migration_files(self, files: list[tuple[int, str, Path]]) -> list[str]:
         """Validate migration files in the migrations directory.
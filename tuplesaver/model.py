@@ -4,7 +4,9 @@ import inspect
 import logging
 import types
 from dataclasses import dataclass, field
-from typing import Any, ClassVar, NamedTuple, Union, dataclass_transform, get_args, get_origin, get_type_hints
+from functools import lru_cache, reduce
+from operator import or_
+from typing import Any, ClassVar, NamedTuple, Union, dataclass_transform, get_type_hints
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,7 @@ class RowMeta(type):
     """Metaclass that transforms classes into frozen dataclasses."""
 
     meta: ClassVar[Meta]
+    _is_table_row: ClassVar[bool]
 
     def __new__(cls, typename: str, bases: tuple[type, ...], ns: dict[str, Any]) -> type:
         new_cls = super().__new__(cls, typename, bases, ns)
@@ -38,10 +41,12 @@ class RowMeta(type):
 
 
 class Row(metaclass=RowMeta):
-    pass
+    _is_table_row = False
 
 
 class TableRow(metaclass=RowMeta):
+    _is_table_row = True  # inherited flag, so `is_row_model` is an attribute lookup rather than an MRO walk
+
     id: int | None = field(default=None, kw_only=True)
 
 
@@ -80,7 +85,7 @@ native_columntypes: dict[type, str] = {
 
 def is_row_model(cls: object) -> bool:
     """Test at runtime whether an object is a Row, e.g. a TableRow model."""
-    return isinstance(cls, type) and issubclass(cls, TableRow)
+    return isinstance(cls, RowMeta) and cls._is_table_row
 
 
 class Meta(NamedTuple):
@@ -88,6 +93,9 @@ class Meta(NamedTuple):
     model_name: str
     table_name: str
     fields: tuple[MetaField, ...]
+    fields_by_name: dict[str, MetaField]
+    sql_columns: str  # e.g. "id, name, size"
+    sql_placeholders: str  # e.g. "?, ?, ?"
 
 
 class MetaField(NamedTuple):
@@ -116,7 +124,7 @@ def make_model_meta(Model: type[TableRow]) -> Meta:
             is_fk=is_row_model(FieldType),
             is_pk=fieldname == "id",
             sql_typename=schematype(FieldType),
-            sql_columndef=_sql_columndef(fieldname, nullable, FieldType),
+            sql_columndef=_sql_id_columndef(nullable, FieldType) if fieldname == "id" else _sql_columndef(fieldname, nullable, FieldType),
         )
         for fieldname, (nullable, FieldType) in zip(fieldnames, unwrapped_types, strict=False)
     )
@@ -128,6 +136,9 @@ def make_model_meta(Model: type[TableRow]) -> Meta:
         model_name=Model.__name__,
         table_name=table_name,
         fields=fields,
+        fields_by_name={f.name: f for f in fields},
+        sql_columns=", ".join(f.name for f in fields),
+        sql_placeholders=", ".join("?" for _ in fields),
     )
 
     ## Validate Meta
@@ -135,7 +146,11 @@ def make_model_meta(Model: type[TableRow]) -> Meta:
     if "_" in meta.model_name:
         raise InvalidTableName(meta.model_name)
 
-    # monkey-patch Model so any Lazy field is transparently unwrapped
+    # monkey-patch Model so any Lazy field is transparently unwrapped. Only foreign keys are ever Lazy, so
+    # models without any keep the C level object.__getattribute__ rather than a Python call per attribute.
+    if not any(f.is_fk for f in fields):
+        return meta
+
     from .cursorproxy import Lazy
 
     def _unwrap_lazyproxy_getattr(self: Row, name: str, /) -> Any:
@@ -159,12 +174,19 @@ def schematype(FieldType: type) -> str:
         return f"{FieldType.__module__}.{FieldType.__qualname__}"
 
 
+def _sql_id_columndef(nullable: bool, FieldType: type) -> str:
+    if not (FieldType is int and nullable):
+        raise FieldZeroIdMalformed(FieldType)
+    return "id [INTEGER] PRIMARY KEY NOT NULL"
+
+
 def _sql_columndef(field_name: str, nullable: bool, FieldType: type) -> str:
-    if field_name == "id":
-        if not (FieldType is int and nullable):
-            raise FieldZeroIdMalformed(FieldType)
-        return "id [INTEGER] PRIMARY KEY NOT NULL"
+    return f"{field_name} {_sql_column_typedef(nullable, FieldType)}"
+
 
+@lru_cache(maxsize=1024)
+def _sql_column_typedef(nullable: bool, FieldType: type) -> str:
+    """Everything in a column definition after the name, cached by type alone so it is shared across fields and models."""
     if nullable:
         nullable_sql = "NULL"
     else:
@@ -179,9 +201,10 @@ def _sql_columndef(field_name: str, nullable: bool, FieldType: type) -> str:
     else:
         fk_clause = ""
 
-    return f"{field_name} [{columntype}] {nullable_sql}{fk_clause}"
+    return f"[{columntype}] {nullable_sql}{fk_clause}"
 
 
+@lru_cache(maxsize=1024)
 def _unwrap_optional_type(type_hint: Any) -> tuple[bool, Any]:
     """Determine if a given type hint is an Optional type
 
@@ -195,17 +218,18 @@ def _unwrap_optional_type(type_hint: Any) -> tuple[bool, Any]:
     - The underlying type if it is Optional, otherwise the original type.
     """
 
+    # Plain classes, by far the most common hint
+    if isinstance(type_hint, type):
+        return False, type_hint
+
     # Not any form of Union type
-    if not (isinstance(type_hint, types.UnionType) or get_origin(type_hint) is Union):
+    if not (isinstance(type_hint, types.UnionType) or getattr(type_hint, '__origin__', None) is Union):
         return False, type_hint
 
-    args = get_args(type_hint)
+    args = type_hint.__args__
     optional = type(None) in args
 
-    underlying_types = tuple(arg for arg in args if arg is not type(None))
-    underlying_type = underlying_types[0]
-    for t in underlying_types[1:]:
-        underlying_type |= t
+    underlying_type = reduce(or_, (arg for arg in args if arg is not type(None)))
 
     return optional, underlying_type
 
@@ -218,8 +242,11 @@ def _get_resolved_annotations(Model: Any) -> dict[str, Any]:
     globalns = getattr(inspect.getmodule(Model), "__dict__", {})
     localns = {}
 
-    for frame in inspect.stack():
-        localns.update(frame.frame.f_locals)
+    # Walk the frames directly, inspect.stack() would also read source context lines for every frame
+    frame = inspect.currentframe()
+    while frame is not None:
+        localns.update(frame.f_locals)
+        frame = frame.f_back
 
     # get_type_hints includes inherited annotations
     hints = get_type_hints(Model, globalns=globalns, localns=localns, include_extras=True)
@@ -12,6 +12,7 @@ from .model import (
     Row,
     TableRow,
     _sql_columndef,
+    _sql_id_columndef,
     _unwrap_optional_type,
     is_row_model,
     schematype,
@@ -67,6 +68,19 @@ def test_unwrap_optional_type() -> None:
     assert _unwrap_optional_type(Optional[OUT]) == (True, (int))  # noqa: UP045
 
 
+def test_unwrap_optional_type__same_hint_across_models() -> None:
+    class A(TableRow):
+        n: int | None
+
+    class B(TableRow):
+        m: int | None
+        k: int
+
+    assert (A.meta.fields[1].nullable, A.meta.fields[1].type) == (True, int)
+    assert (B.meta.fields[1].nullable, B.meta.fields[1].type) == (True, int)
+    assert (B.meta.fields[2].nullable, B.meta.fields[2].type) == (False, int)
+
+
 def test_is_row_model() -> None:
     assert is_row_model(int) is False
     assert is_row_model(str) is False
@@ -128,9 +142,9 @@ def test_sqltypename() -> None:
 
 
 def test_column_definition() -> None:
-    assert _sql_columndef('id', True, int) == "id [INTEGER] PRIMARY KEY NOT NULL"
+    assert _sql_id_columndef(True, int) == "id [INTEGER] PRIMARY KEY NOT NULL"
     with pytest.raises(FieldZeroIdMalformed):
-        _sql_columndef('id', False, int)
+        _sql_id_columndef(False, int)
 
     assert _sql_columndef("value", False, float) == "value [REAL] NOT NULL"
     assert _sql_columndef("value", True, float) == "value [REAL] NULL"
@@ -158,14 +172,16 @@ def test_meta__valid_table_model() -> None:
     class ModelA(TableRow):
         name: str
 
+    id_field = MetaField(name="id", type=int, full_type=int | None, nullable=True, is_fk=False, is_pk=True, sql_typename="INTEGER", sql_columndef="id [INTEGER] PRIMARY KEY NOT NULL")
+    name_field = MetaField(name="name", type=str, full_type=str, nullable=False, is_fk=False, is_pk=False, sql_typename="TEXT", sql_columndef="name [TEXT] NOT NULL")
     assert ModelA.meta == Meta(
         Model=ModelA,
         model_name="ModelA",
         table_name="ModelA",
-        fields=(
-            MetaField(name="id", type=int, full_type=int | None, nullable=True, is_fk=False, is_pk=True, sql_typename="INTEGER", sql_columndef="id [INTEGER] PRIMARY KEY NOT NULL"),
-            MetaField(name="name", type=str, full_type=str, nullable=False, is_fk=False, is_pk=False, sql_typename="TEXT", sql_columndef="name [TEXT] NOT NULL"),
-        ),
+        fields=(id_field, name_field),
+        fields_by_name={"id": id_field, "name": name_field},
+        sql_columns="id, name",
+        sql_placeholders="?, ?",
     )
 
 
@@ -79,25 +79,19 @@ def render_query_def_func(Model: type[TableRow], func: Callable) -> str:
                 if Model.__name__ == name:
                     ModelName = name
                     # This is correct root model for a field specification
-                    found_intermediatte_field = None
                     if len(stack) > 2:
                         join_alias_parts = []
                         meta = basemeta
                         last_jalias = basemeta.table_name
                         for attrlevel in stack[1:-1]:
                             join_alias_parts.append(attrlevel.attr)
-                            # TODO: save this looping by add a field by name dict to meta
-                            for field in meta.fields:
-                                if field.name == attrlevel.attr:
-                                    found_intermediatte_field = field
-                                    assert isinstance(field.type, type) and issubclass(field.type, TableRow)
-                                    meta = field.type.meta
-                                    jalias = "_".join(join_alias_parts)
-                                    joins[jalias] = f"JOIN {meta.table_name} {jalias} ON {last_jalias}.{field.name} = {jalias}.id"
-                                    last_jalias = "_".join(join_alias_parts)
-
-                                    break
-                            assert found_intermediatte_field is not None, f"Field {attrlevel.attr} not found in {ModelName}"
+                            field = meta.fields_by_name.get(attrlevel.attr)
+                            assert field is not None, f"Field {attrlevel.attr} not found in {ModelName}"
+                            assert isinstance(field.type, type) and issubclass(field.type, TableRow)
+                            meta = field.type.meta
+                            jalias = "_".join(join_alias_parts)
+                            joins[jalias] = f"JOIN {meta.table_name} {jalias} ON {last_jalias}.{field.name} = {jalias}.id"
+                            last_jalias = "_".join(join_alias_parts)
                         jalias = "_".join(join_alias_parts)
                         table_or_alias = jalias
                         finalmeta = meta
@@ -105,12 +99,7 @@ def render_query_def_func(Model: type[TableRow], func: Callable) -> str:
                         assert basemeta.table_name is not None, "Base model must have a table name defined."
                         table_or_alias = basemeta.table_name
                         finalmeta = basemeta
-                    final_field = None
-                    # TODO: save this looping by add a field by name dict to meta
-                    for field in finalmeta.fields:
-                        if field.name == stack[-1].attr:
-                            final_field = field
-                            break
+                    final_field = finalmeta.fields_by_name.get(stack[-1].attr)
                     assert final_field is not None, f"Field {stack[-1].attr} not found in {ModelName}"
                     query_parts.append(table_or_alias + "." + final_field.name)
                 elif name in parameter_names:
@@ -156,59 +145,71 @@ def generate_select_sql(Model: type[TableRow]) -> str:
     return f"SELECT {', '.join(meta.table_name + '.' + f.name for f in meta.fields)} FROM {meta.table_name}"
 
 
+@cache
+def generate_select_by_id_sql(Model: type[TableRow]) -> str:
+    return f"{generate_select_sql(Model)} WHERE id = ?"
+
+
+@cache
+def generate_select_tree_sql(Model: type[TableRow]) -> str:
+    """Select a row by id, along with every row reachable from it through the Model's self-referencing foreign keys."""
+    meta = Model.meta
+    self_fks = [f.name for f in meta.fields if f.type is Model]
+    if not self_fks:
+        return generate_select_by_id_sql(Model)
+    # Only ids are carried through the recursion, one recursive SELECT per foreign key. UNION (rather than
+    # UNION ALL) visits parts shared between branches (or cycles) once, and dedupes integers, not whole rows.
+    steps = ' '.join(f"UNION SELECT {fk} FROM {meta.table_name} JOIN tree USING (id) WHERE {fk} IS NOT NULL" for fk in self_fks)
+    return f"WITH RECURSIVE tree(id) AS (VALUES (?) {steps}) {generate_select_sql(Model)} WHERE id IN tree"
+
+
 @lru_cache(maxsize=256)
-def generate_select_by_field_sql(Model: type[TableRow], field_names: frozenset[str]) -> str:
+def generate_select_by_field_sql(Model: type[TableRow], field_names: frozenset[str], limit: int | None = None) -> str:
     select = generate_select_sql(Model)
     where_clause = " AND ".join(f"{field} = :{field}" for field in sorted(field_names))
-    return dedent(f"""
-        {select}
-        WHERE {where_clause}
-        """).strip()
+    if limit is not None:
+        return f"{select} WHERE {where_clause} LIMIT {limit}"
+    return f"{select} WHERE {where_clause}"
+
+
+# Batch sizes for `generate_select_by_ids_sql`, batches are padded up to the next size so only a
+# handful of distinct statements reach the apsw statement cache.
+ID_BATCH_SIZES = (1, 4, 16, 64, 256, 1024)
+
+
+@lru_cache(maxsize=64)
+def generate_select_by_ids_sql(Model: type[TableRow], count: int) -> str:
+    select = generate_select_sql(Model)
+    return f"{select} WHERE id IN ({', '.join('?' * count)})"
 
 
 @cache
 def generate_insert_sql(Model: type[TableRow]) -> str:
     meta = Model.meta
     assert meta.table_name is not None, "Table name must be defined for the model to modify it."
-    return dedent(f"""
-        INSERT INTO {meta.table_name} (
-            {', '.join(f.name for f in meta.fields)}
-        ) VALUES (
-            {', '.join(f":{f.name}" for f in meta.fields)}
-        )
-        RETURNING {', '.join(f.name for f in meta.fields)}
-        """).strip()
+    return f"INSERT INTO {meta.table_name} ({meta.sql_columns}) VALUES ({meta.sql_placeholders}) RETURNING {meta.sql_columns}"
 
 
 @cache
 def generate_update_sql(Model: type[TableRow]) -> str:
     meta = Model.meta
     assert meta.table_name is not None, "Table name must be defined for the model to modify it."
-    return dedent(f"""
-        UPDATE {meta.table_name}
-        SET {', '.join(f"{f.name} = :{f.name}" for f in meta.fields)}
-        WHERE id = :id
-        RETURNING {', '.join(f.name for f in meta.fields)}
-        """).strip()
+    # Bound with the row's own parameters, numbered so id (?1) is only bound once. id is left out of
+    # SET, even set to itself SQLite would treat it as a rowid change, unless it is the only field.
+    assignments = [f'{f.name} = ?{i}' for i, f in enumerate(meta.fields, 1) if not f.is_pk] or ['id = ?1']
+    return f"UPDATE {meta.table_name} SET {', '.join(assignments)} WHERE id = ?1 RETURNING {meta.sql_columns}"
 
 
 @lru_cache(maxsize=256)
-def generate_update_set_fields_sql(Model: type[TableRow], field_names: frozenset[str]) -> str:
+def generate_update_set_fields_sql(Model: type[TableRow], field_names: tuple[str, ...]) -> str:
+    """Positional parameters, the values for `field_names` in order, then the id."""
     meta = Model.meta
     assert meta.table_name is not None, "Table name must be defined for the model to modify it."
-    return dedent(f"""
-        UPDATE {meta.table_name}
-        SET {', '.join(f"{name} = :{name}" for name in field_names)}
-        WHERE id = :id
-        RETURNING {', '.join(f.name for f in meta.fields)}
-        """).strip()
+    return f"UPDATE {meta.table_name} SET {', '.join(f'{name} = ?' for name in field_names)} WHERE id = ? RETURNING {meta.sql_columns}"
 
 
 @cache
 def generate_delete_sql(Model: type[TableRow]) -> str:
     meta = Model.meta
     assert meta.table_name is not None, "Table name must be defined for the model to modify it."
-    return dedent(f"""
-        DELETE FROM {meta.table_name}
-        WHERE id = :id
-        """).strip()
+    return f"DELETE FROM {meta.table_name} WHERE id = :id"